@@ -0,0 +1,134 @@
+"""
+Cold-import budget for the app entry point and every page.
+
+Runs the module-level imports of each script in a fresh interpreter with -X importtime,
+after the imports every page shares (numpy, pandas, streamlit). Only what the script
+adds on top counts: that part is small and stable across runs and machines, while the
+shared ~700 ms varies by a few hundred. Fails (exit code 1) when a script's own imports
+take more than its stored baseline plus the headroom, or when it imports a module that
+must only be loaded on first use (Plotly Express, PIL, the Supabase SDK).
+
+    python check_import_budget.py                 # stored baselines
+    python check_import_budget.py --headroom-ms 30 --repeat 9
+"""
+import os
+import re
+import ast
+import sys
+import glob
+import argparse
+import statistics
+import subprocess
+
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARED_IMPORTS = ["numpy", "pandas", "streamlit"]
+# Median own import time (ms) of each script over the shared imports, measured on the
+# dev machine; update when a page legitimately gains an eager import
+IMPORT_BASELINE_MS = {
+    "streamlit_app.py": 90,
+    "pages/01_🅱️_Biwenger_Stats.py": 115,
+    "pages/02_💰_Market_Analysis.py": 120,
+    "pages/03_📰_Team_News.py": 95,
+    "pages/04_🚧_dev_work.py": 100,
+}
+# Above the run-to-run spread of the medians (~±20 ms), below what an eager
+# `import plotly.express` adds on top of the shared imports (~190-240 ms on page 02)
+IMPORT_HEADROOM_MS = 50
+# Heavy modules deferred to first use: importing a page must not load them
+DEFERRED_MODULES = ["plotly.express", "PIL", "supabase", "postgrest"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def script_imports(path: str) -> str:
+    """
+    Source of the module-level import statements of a script (what runs before the
+    first line of page code).
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def measure_imports(code: str) -> tuple[float, dict]:
+    """
+    Run the shared imports and then `code` in a fresh interpreter with -X importtime.
+
+    Returns:
+        (ms of the top-level imports `code` adds, {module: cumulative ms} of every module loaded)
+    """
+    prelude = "\n".join(f"import {m}" for m in SHARED_IMPORTS)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{prelude}\n{code}"],
+        cwd=ROOT_DIR,
+        env={**os.environ, "PYTHONPATH": ROOT_DIR},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+
+    own_us, modules, shared_left = 0, {}, set(SHARED_IMPORTS)
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative) / 1000
+        if indent:
+            continue
+        # Top-level lines come in import order: the script's start after the last shared one
+        if shared_left:
+            shared_left.discard(name)
+        else:
+            own_us += int(cumulative)
+    return own_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--headroom-ms", type=float, default=IMPORT_HEADROOM_MS)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per script, the median counts")
+    args = parser.parse_args()
+
+    scripts = [os.path.join(ROOT_DIR, "streamlit_app.py")] + sorted(glob.glob(os.path.join(ROOT_DIR, "pages", "*.py")))
+    failures = []
+
+    for path in scripts:
+        name = os.path.relpath(path, ROOT_DIR).replace(os.sep, "/")
+        try:
+            runs = [measure_imports(script_imports(path)) for _ in range(max(1, args.repeat))]
+        except RuntimeError as e:
+            failures.append(f"{name}: {e}")
+            print(f"❌ {name}: {e}")
+            continue
+
+        own_ms = statistics.median(ms for ms, _ in runs)
+        modules = runs[0][1]
+        deferred = [m for m in DEFERRED_MODULES if m in modules]
+        heaviest = sorted(((ms, m) for m, ms in modules.items()
+                           if "." not in m and m not in SHARED_IMPORTS), reverse=True)[:4]
+
+        baseline = IMPORT_BASELINE_MS.get(name)
+        budget = None if baseline is None else baseline + args.headroom_ms
+        over = budget is not None and own_ms > budget
+        ok = not over and not deferred and budget is not None
+        print(f"{'✅' if ok else '❌'} {name}: {own_ms:.0f} ms over the shared imports "
+              f"(baseline {baseline if baseline is not None else '?'} ms, budget "
+              f"{f'{budget:.0f}' if budget is not None else '?'} ms) | "
+              + ", ".join(f"{m} {ms:.0f}" for ms, m in heaviest))
+        if budget is None:
+            failures.append(f"{name}: no baseline in IMPORT_BASELINE_MS")
+        elif over:
+            failures.append(f"{name}: {own_ms:.0f} ms over the {budget:.0f} ms budget (baseline {baseline} ms)")
+        if deferred:
+            failures.append(f"{name}: imports {', '.join(deferred)} at module level")
+
+    for failure in failures:
+        print(f"   {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
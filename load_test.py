@@ -0,0 +1,352 @@
+"""
+Concurrent-session load test for the Streamlit pages.
+
+Starts an offline PostgREST stub filled with synthetic Biwenger tables, points the app at
+it (BIWENGER_SUPABASE_SECRETS) and runs N simulated sessions at once with Streamlit's
+AppTest. Every session clicks through filters, axis selectors, player multiselects and
+buttons at random; every interaction is one timed rerun. All sessions share the process
+caches, as they would on one server.
+
+    python load_test.py --sessions 1 5 10 20 --actions 10 --pages 01 02 03
+
+Reports per concurrency level: rerun latency p50/p95/p99, RSS growth per session and the
+st.cache_data/st.cache_resource hit rate.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+import pandas as pd
+
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES = {
+    "01": os.path.join(ROOT_DIR, "pages", "01_🅱️_Biwenger_Stats.py"),
+    "02": os.path.join(ROOT_DIR, "pages", "02_💰_Market_Analysis.py"),
+    "03": os.path.join(ROOT_DIR, "pages", "03_📰_Team_News.py"),
+}
+# Page 03 looks news up by the teams it has a crest for
+NEWS_TEAMS = sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(ROOT_DIR, "team_crests", "*.png")))
+NEWS_TAGS = ['["lesiones_sanciones"]', '["previa_siguiente_partido"]', '["cronica_partido"]', '["fichajes"]', '["renovaciones"]']
+INTERACTIVE_WIDGETS = ("multiselect", "selectbox", "radio", "button")
+RERUN_TIMEOUT_S = 120
+
+
+# --- Offline data stub ---
+
+def synthetic_tables(n_players: int = 300, n_days: int = 120, seed: int = 0) -> dict:
+    """
+    Rows of every table the pages read, shaped like the Supabase ones (ISO date strings).
+    """
+    rng = np.random.default_rng(seed)
+    players = [f"Jugador {i:03d}" for i in range(n_players)]
+    teams = [f"Equipo {i:02d}" for i in range(20)]
+    positions = ["Goalkeeper", "Defender", "Midfielder", "Forward"]
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=n_days, freq="D")
+    iso = dates.strftime("%Y-%m-%d").tolist()
+
+    player_value = [
+        {"id": i, "player_name": p, "date": d, "market_value_eur": int(v)}
+        for i, (p, d, v) in enumerate(zip(
+            np.repeat(players, n_days), iso * n_players,
+            np.cumsum(rng.integers(-3, 4, (n_players, n_days)), axis=1).ravel() * 10_000 + 5_000_000,
+        ))
+    ]
+    player_matches = [
+        {"id": i, "player_name": p, "match_date": d, "points": int(rng.integers(-2, 15)),
+         "minutes_played": int(rng.integers(0, 91)), "season_label": "2025/26",
+         "best_xi": False, "events": [], "team": teams[hash(p) % 20], "as_of_date": d}
+        for i, (p, d) in enumerate((p, d) for p in players for d in iso[::7])
+    ]
+    player_stats = [
+        {"id": i, "player_name": p, "as_of_date": d, "season": 2026, "team": teams[j % 20],
+         "position": positions[j % 4], "status_detail": None,
+         "points": int(rng.integers(0, 200)), "average": round(float(rng.random() * 10), 2),
+         "matches_played": int(rng.integers(1, 30)), "value": int(rng.integers(1, 300)) * 100_000,
+         "min_value": 0, "max_value": 0,
+         "market_purchases_pct": int(rng.integers(1, 100)), "market_sales_pct": int(rng.integers(1, 100)),
+         "market_usage_pct": int(rng.integers(0, 100))}
+        for i, (j, p, d) in enumerate((j, p, d) for j, p in enumerate(players) for d in iso[3::7])
+    ]
+    news_teams = NEWS_TEAMS or teams
+    articles = [
+        {"id": i, "team": news_teams[i % len(news_teams)], "tag": NEWS_TAGS[i // len(news_teams) % len(NEWS_TAGS)],
+         "markdown_document": f"{players[int(rng.integers(n_players))]} es baja por lesion.",
+         "created_at": (pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=int(h))).isoformat()}
+        for i, h in enumerate(rng.integers(1, 24 * 14, 400))
+    ]
+    return {
+        "biwenger_player_value": player_value,
+        "biwenger_player_matches": player_matches,
+        "biwenger_player_stats": player_stats,
+        "biwenger_current_team": [{"id": i, "name": p} for i, p in enumerate(players[:15])],
+        "article_for_streamlit": articles,
+    }
+
+
+def _postgrest_filter(rows: list, column: str, expression: str) -> list:
+    op, _, arg = expression.partition(".")
+    if op == "in":
+        values = {v.strip('"') for v in arg.strip("()").split(",")}
+        return [r for r in rows if str(r.get(column)) in values]
+    compare = {
+        "eq": lambda v: str(v) == arg,
+        "gt": lambda v: v is not None and str(v) > arg,
+        "gte": lambda v: v is not None and str(v) >= arg,
+        "lt": lambda v: v is not None and str(v) < arg,
+        "lte": lambda v: v is not None and str(v) <= arg,
+    }.get(op)
+    return [r for r in rows if compare(r.get(column))] if compare else rows
+
+
+def make_stub_handler(tables: dict, counter: Counter):
+    class PostgrestStub(BaseHTTPRequestHandler):
+        # Just enough of PostgREST for the loaders: select, eq/in/gt filters, order,
+        # offset/limit and count=exact
+        def do_GET(self):
+            url = urlparse(self.path)
+            prefix, _, table = url.path.rpartition("/")
+            counter[table] += 1
+            # Full path checked, so a client pointed at another service (/storage/v1) fails
+            if prefix != "/rest/v1" or table not in tables:
+                return self._send(404, {"message": f"Could not find the table 'public.{table}'"})
+
+            rows = tables[table]
+            params = parse_qsl(url.query, keep_blank_values=True)
+            select, offset, limit = "*", 0, None
+            for key, value in params:
+                if key == "select":
+                    select = value
+                elif key == "offset":
+                    offset = int(value)
+                elif key == "limit":
+                    limit = int(value)
+                elif key == "order":
+                    column, _, direction = value.partition(".")
+                    rows = sorted(rows, key=lambda r: (r.get(column) is None, str(r.get(column))),
+                                  reverse=direction.startswith("desc"))
+                else:
+                    rows = _postgrest_filter(rows, key, value)
+
+            total = len(rows)
+            page = rows[offset:offset + limit if limit is not None else None]
+            if select != "*":
+                columns = select.split(",")
+                page = [{c: r.get(c) for c in columns} for r in page]
+            headers = {"Content-Range": f"{offset}-{offset + max(len(page) - 1, 0)}/{total}"}
+            self._send(200, page, headers)
+
+        def _send(self, status: int, body, headers=None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return PostgrestStub
+
+
+def start_stub(tables: dict) -> tuple[ThreadingHTTPServer, Counter]:
+    """
+    Serve `tables` on a local port and point the app's Supabase client at it.
+    """
+    counter: Counter = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_stub_handler(tables, counter))
+    threading.Thread(target=server.serve_forever, name="postgrest-stub", daemon=True).start()
+
+    secrets_path = os.path.join(tempfile.mkdtemp(prefix="biwenger-load-test-"), "supabase.toml")
+    with open(secrets_path, "w") as f:
+        f.write(f'[supabase]\nurl = "http://127.0.0.1:{server.server_port}"\nanon_key = "offline-stub"\n')
+    os.environ["BIWENGER_SUPABASE_SECRETS"] = secrets_path
+    # Data must flow through the loaders, not an on-disk snapshot
+    os.environ["BIWENGER_SNAPSHOT"] = "off"
+    return server, counter
+
+
+# --- Measurements ---
+
+_cache_lock = threading.Lock()
+cache_counts: Counter = Counter()
+
+
+def instrument_caches() -> None:
+    """
+    Count st.cache_data / st.cache_resource hits and misses (process-wide).
+    """
+    from streamlit.runtime.caching.cache_utils import CachedFunc
+
+    handle_hit, handle_miss = CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss
+
+    def counted_hit(self, *args, **kwargs):
+        with _cache_lock:
+            cache_counts["hits"] += 1
+        return handle_hit(self, *args, **kwargs)
+
+    def counted_miss(self, *args, **kwargs):
+        with _cache_lock:
+            cache_counts["misses"] += 1
+        return handle_miss(self, *args, **kwargs)
+
+    CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss = counted_hit, counted_miss
+
+
+def share_test_runtime() -> None:
+    """
+    AppTest sets up process-wide state for the duration of each run and resets it at the
+    end, which breaks runs still going in other threads: the mock Runtime (give every run
+    one shared mock) and the global.appTest option (keep it on for the whole test).
+    """
+    from unittest.mock import MagicMock
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: shared)
+    config.set_option("global.appTest", True)
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+# --- Simulated sessions ---
+
+def random_interaction(at, rng: random.Random) -> str:
+    """
+    Change one widget of the current page at random. Returns a label of what was done.
+    """
+    widgets = [(kind, w) for kind in INTERACTIVE_WIDGETS for w in getattr(at, kind)
+               if not getattr(w, "disabled", False)]
+    if not widgets:
+        return "rerun"
+
+    kind, widget = rng.choice(widgets)
+    if kind == "button":
+        widget.click()
+    elif kind == "multiselect":
+        options = widget.options or []
+        widget.set_value(rng.sample(options, k=min(len(options), rng.randint(0, 3))))
+    elif widget.options:
+        widget.set_value(rng.choice(widget.options))
+    return f"{kind}:{widget.label.strip()}"
+
+
+def run_session(page: str, actions: int, seed: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(PAGES[page], default_timeout=RERUN_TIMEOUT_S)
+    latencies, errors = [], []
+
+    for step in range(actions + 1):
+        label = "first run" if step == 0 else random_interaction(at, rng)
+        start = time.perf_counter()
+        try:
+            at.run()
+        except Exception as e:
+            errors.append(f"{label}: {e!r}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            errors.extend(f"{label}: {e.message}" for e in at.exception)
+
+    return {"page": page, "latencies_ms": latencies[1:], "first_run_ms": latencies[0], "errors": errors}
+
+
+def run_level(n_sessions: int, pages: list[str], actions: int, seed: int) -> dict:
+    hits_before, misses_before = cache_counts["hits"], cache_counts["misses"]
+    rss_before = rss_mb()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        results = list(pool.map(
+            lambda i: run_session(pages[i % len(pages)], actions, seed + i),
+            range(n_sessions),
+        ))
+    wall_s = time.perf_counter() - start
+
+    latencies = np.array([ms for r in results for ms in r["latencies_ms"]] or [np.nan])
+    hits, misses = cache_counts["hits"] - hits_before, cache_counts["misses"] - misses_before
+    return {
+        "sessions": n_sessions,
+        "reruns": int(np.isfinite(latencies).sum()),
+        "p50_ms": np.percentile(latencies, 50),
+        "p95_ms": np.percentile(latencies, 95),
+        "p99_ms": np.percentile(latencies, 99),
+        "first_run_p50_ms": np.median([r["first_run_ms"] for r in results]),
+        "rss_per_session_mb": (rss_mb() - rss_before) / n_sessions,
+        "cache_hit_rate": hits / max(hits + misses, 1),
+        "wall_s": wall_s,
+        "errors": [e for r in results for e in r["errors"]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--actions", type=int, default=10, help="interactions per session")
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=sorted(PAGES))
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, stub_requests = start_stub(synthetic_tables(args.players, args.days, args.seed))
+    instrument_caches()
+    share_test_runtime()
+    # The session threads have no ScriptRunContext of their own, by design
+    from streamlit.logger import set_log_level
+    set_log_level(logging.ERROR)
+    sys.path.insert(0, ROOT_DIR)
+    # Page 03 reads its crests from a path relative to the app directory
+    os.chdir(ROOT_DIR)
+
+    # Cold start once, so every level measures a server with warm caches
+    cold = run_level(1, args.pages, actions=0, seed=args.seed)
+    print(f"Cold first run: {cold['first_run_p50_ms']:.0f} ms, {sum(stub_requests.values())} stub requests")
+
+    header = f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} " \
+             f"{'1st run':>8} {'MB/sess':>8} {'cache hit':>9} {'wall s':>7} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+    for n_sessions in args.sessions:
+        level = run_level(n_sessions, args.pages, args.actions, args.seed + 1000 * n_sessions)
+        print(f"{level['sessions']:>8} {level['reruns']:>7} {level['p50_ms']:>8.0f} {level['p95_ms']:>8.0f} "
+              f"{level['p99_ms']:>8.0f} {level['first_run_p50_ms']:>8.0f} {level['rss_per_session_mb']:>8.1f} "
+              f"{level['cache_hit_rate']:>9.1%} {level['wall_s']:>7.1f} {len(level['errors']):>6}")
+        for error in level["errors"][:3]:
+            print(f"         ⚠️ {error}")
+
+    print(f"Stub requests by table: {dict(stub_requests)}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
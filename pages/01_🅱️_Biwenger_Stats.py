@@ -1,15 +1,37 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 from utils import (
+    load_concurrently,
     load_player_stats,
+    load_player_stats_ranked,
+    load_player_stats_as_of,
+    load_player_stats_history_index,
+    load_player_form,
+    load_stats_cube,
+    load_similarity_index,
     load_current_team_players
 )
 from utils_plotting import (
     render_player_scatter,
-    POSITION_COLOURS
+    render_breakeven_curve,
+    POSITION_COLOURS,
+    STATS_CHART_METRICS,
+    FORM_CHART_METRICS
+)
+from utils_simulation import (
+    build_price_grid,
+    simulate_cost_sweep
+)
+from utils_layouts import (
+    filter_layouts,
+    time_travel_layout
+)
+from utils_stats_cube import lookup_tertiles
+from utils_news import load_player_news_flags
+from utils_similarity import find_similar_players
+from utils_optimizer import (
+    FORMATIONS,
+    optimize_squad
 )
-from utils_layouts import filter_layouts
 import re
 
 # --- Page Setup ---
@@ -18,7 +40,15 @@ st.set_page_config(layout="wide", page_title="Estadisticas de jugadores de Biwen
 # --- Session state initialization ---
 
 # --- Global variables ---
-player_stats_pd = load_player_stats()
+# Cold start: fetch both tables at once instead of one after another
+load_concurrently({
+    "player_stats": load_player_stats,
+    "current_team": load_current_team_players,
+})
+
+chart_metrics = STATS_CHART_METRICS
+player_stats_pd = load_player_stats_ranked(tuple(chart_metrics))
+stats_cube = load_stats_cube(tuple(chart_metrics))
 current_team_pd = load_current_team_players()
 
 unique_teams = sorted(player_stats_pd['team'].dropna().unique().tolist())
@@ -27,6 +57,10 @@ unique_players = sorted(player_stats_pd['player_name'].dropna().unique().tolist(
 unique_season = sorted(player_stats_pd['season'].dropna().unique().tolist(), reverse=True)
 current_team_players = sorted(current_team_pd['name'].dropna().unique().tolist())
 
+# Players mentioned in recent injury/suspension news (inverted index, no body scans here)
+player_news_flags = load_player_news_flags(tuple(unique_players))
+player_stats_pd = player_stats_pd.assign(noticias=player_stats_pd['player_name'].map(player_news_flags).fillna(""))
+
 # --- Main page ---
 st.title("Explora las estadisticas de los jugadores de Biwenger")
 
@@ -39,6 +73,17 @@ with st.container(border=True):
         unique_players=unique_players
     )
 
+    # --- Point-in-time view: latest snapshot per player at the chosen date ---
+    time_travel_date = time_travel_layout(load_player_stats_history_index()["dates"])
+    if time_travel_date is not None:
+        player_stats_pd = (
+            load_player_stats_as_of(time_travel_date, tuple(chart_metrics))
+            .assign(noticias=lambda d: d['player_name'].map(player_news_flags).fillna(""))
+        )
+
+    # --- Recent form (last matches), kept up to date incrementally ---
+    player_stats_pd = player_stats_pd.merge(load_player_form(), on="player_name", how="left")
+
     # --- Filter data based on selection ---
     if season:
         player_stats_pd = player_stats_pd[player_stats_pd['season'].isin(season)]
@@ -55,9 +100,8 @@ with st.container(border=True):
         st.write("###### Escoge las métricas a comparar:")
 
         chart_cols = st.columns([1, 1, 4])
-        chart_metrics = ['points', 'value', 'matches_played', 'average', 'points_per_value']
-        x_metric = chart_cols[0].selectbox("X-axis", chart_metrics, index=0)
-        y_metric = chart_cols[1].selectbox("Y-axis", chart_metrics, index=1)
+        x_metric = chart_cols[0].selectbox("X-axis", chart_metrics + FORM_CHART_METRICS, index=0)
+        y_metric = chart_cols[1].selectbox("Y-axis", chart_metrics + FORM_CHART_METRICS, index=1)
 
         fig = render_player_scatter(
             player_stats_pd,
@@ -70,6 +114,11 @@ with st.container(border=True):
             position_colors=POSITION_COLOURS,
             show_tertiles=True,
             height=chart_height,
+            # The cube holds the latest data only; past dates compute their guides directly
+            tertiles=None if time_travel_date is not None else {
+                m: lookup_tertiles(stats_cube, m, season, position, team) for m in (x_metric, y_metric)
+            },
+            hover_extra=[f"{m}_pct_{seg}" for m in (x_metric, y_metric) for seg in ("position", "team")] + ["noticias"],
         )
 
         st.plotly_chart(fig, use_container_width=False, key="main_chart")
@@ -84,20 +133,16 @@ with st.container(border=True):
         coste_de_jugador = re.sub(r"[^\d]", "", st.text_input("Coste del jugador (€)", value="€2,500,000"))
         coste_de_jugador = int(coste_de_jugador) if coste_de_jugador else 0
 
-        player_stats_pd_simulation = (
-            player_stats_pd.copy()
-            .query("player_name == @jugador_a_simular or player_name not in @unique_players")
-            .assign(value = coste_de_jugador,
-                    points_per_value = lambda df: np.round(np.maximum(0, df['points'] / df['value'].replace(0, pd.NA))*100_000, 2),
-                    player_name = jugador_a_simular_text,
-                    )
-        )
-
-        player_stats_pd = pd.concat([player_stats_pd_simulation, player_stats_pd])
+        # Only the simulated rows are built; the full frame is never copied or concatenated
+        player_stats_pd_simulation = simulate_cost_sweep(
+            player_stats_pd,
+            players=[jugador_a_simular],
+            prices=[coste_de_jugador],
+        ).assign(player_name=jugador_a_simular_text)
 
         chart_cols_2 = st.columns([1, 1, 4])
-        x_metric = chart_cols_2[0].selectbox("X-axis ", chart_metrics, index=0)
-        y_metric = chart_cols_2[1].selectbox("Y-axis ", chart_metrics, index=len(chart_metrics)-1)
+        x_metric = chart_cols_2[0].selectbox("X-axis ", chart_metrics + FORM_CHART_METRICS, index=0)
+        y_metric = chart_cols_2[1].selectbox("Y-axis ", chart_metrics + FORM_CHART_METRICS, index=len(chart_metrics)-1)
 
         fig = render_player_scatter(
             player_stats_pd,
@@ -106,12 +151,97 @@ with st.container(border=True):
             position_col="position",
             player_name_col="player_name",
             current_team_players=current_team_players,
-            extra_highlight_players=[jugador_a_simular, jugador_a_simular_text],
+            extra_highlight_players=[jugador_a_simular],
             position_colors=POSITION_COLOURS,
             show_tertiles=True,
             height=chart_height,
+            simulated_df=player_stats_pd_simulation,
         )
 
         st.plotly_chart(fig, use_container_width=False, key="simulation_chart")
 
+    with st.container(border=True):
+        st.subheader("Curva de rentabilidad segun el coste")
+        st.write("###### ¿A partir de que precio deja de compensar el fichaje?")
+
+        sweep_cols = st.columns([2, 2])
+        jugadores_a_barrer = sweep_cols[0].multiselect(
+            "Jugadores a simular",
+            options=unique_players,
+            default=[jugador_a_simular],
+        )
+        max_market_value = int(player_stats_pd['value'].max()) if not player_stats_pd.empty else 0
+        rango_de_coste = sweep_cols[1].slider(
+            "Rango de coste (€)",
+            min_value=0,
+            max_value=max(max_market_value * 2, 1_000_000),
+            value=(100_000, max(max_market_value, 1_000_000)),
+            step=100_000,
+        )
+
+        sweep_pd = simulate_cost_sweep(
+            player_stats_pd,
+            players=jugadores_a_barrer,
+            prices=build_price_grid(*rango_de_coste),
+        )
+
+        fig_sweep = render_breakeven_curve(sweep_pd, height=chart_height)
+        st.plotly_chart(fig_sweep, use_container_width=True, key="breakeven_chart")
+
+    with st.container(border=True):
+        st.subheader("Busca jugadores similares mas baratos")
+        st.write("###### Alternativas de la misma posicion por debajo de un precio maximo")
+
+        similar_cols = st.columns([2, 2, 1])
+        jugador_de_referencia = similar_cols[0].selectbox("Jugador de referencia", options=unique_players, key="similar_player")
+        valor_de_referencia = player_stats_pd.loc[player_stats_pd['player_name'] == jugador_de_referencia, 'value']
+        precio_maximo = similar_cols[1].number_input(
+            "Precio maximo (€)",
+            min_value=0,
+            value=int(valor_de_referencia.iloc[0]) if not valor_de_referencia.empty else 5_000_000,
+            step=100_000,
+        )
+        numero_de_similares = similar_cols[2].number_input("Numero de jugadores", min_value=1, max_value=25, value=5)
+
+        similar_players_pd = find_similar_players(
+            load_similarity_index(),
+            player=jugador_de_referencia,
+            k=numero_de_similares,
+            max_price=precio_maximo,
+            candidates=player_stats_pd['player_name'],
+        )
+
+        if similar_players_pd.empty:
+            st.warning("No hay jugadores similares con los filtros actuales.")
+        else:
+            st.dataframe(similar_players_pd, hide_index=True, use_container_width=True)
+
+    with st.container(border=True):
+        st.subheader("Optimiza tu plantilla con un presupuesto")
+        st.write("###### El once que mas puntos suma sin pasarse del presupuesto")
+
+        optimizer_cols = st.columns([1, 1, 1, 2])
+        presupuesto = optimizer_cols[0].number_input("Presupuesto (€)", min_value=0, value=20_000_000, step=500_000)
+        formacion = optimizer_cols[1].selectbox("Formacion", options=list(FORMATIONS.keys()), index=3)
+        metrica_a_maximizar = optimizer_cols[2].selectbox("Metrica a maximizar", options=['points', 'average'])
+        contar_equipo_actual = optimizer_cols[3].checkbox(
+            "Mi equipo actual ya esta pagado (sugerir fichajes)",
+            value=True,
+        )
+
+        lineup_pd = optimize_squad(
+            player_stats_pd,
+            budget=presupuesto,
+            formation=FORMATIONS[formacion],
+            points_col=metrica_a_maximizar,
+            owned_players=current_team_players if contar_equipo_actual else None,
+        )
 
+        if lineup_pd.empty:
+            st.warning("No hay ninguna alineacion posible con este presupuesto y los filtros actuales.")
+        else:
+            metric_cols = st.columns(3)
+            metric_cols[0].metric("Puntos", f"{lineup_pd[metrica_a_maximizar].sum():,.0f}")
+            metric_cols[1].metric("Coste de fichajes", f"€{lineup_pd.loc[~lineup_pd['owned'], 'value'].sum():,.0f}")
+            metric_cols[2].metric("Fichajes", int((~lineup_pd['owned']).sum()))
+            st.dataframe(lineup_pd, hide_index=True, use_container_width=True)
@@ -1,22 +1,58 @@
 import streamlit as st
 import pandas as pd
 from utils import (
+    load_concurrently,
     load_player_stats,
+    load_player_matches,
+    load_market_value,
+    load_player_stats_ranked,
+    load_player_stats_as_of,
+    load_player_stats_history_index,
+    load_stats_cube,
     load_current_team_players,
+    load_market_trends,
+    load_top_movers,
+    load_squad_matrices,
     join_data
 )
 from utils_plotting import (
     render_player_scatter,
     POSITION_COLOURS,
+    MARKET_CHART_METRICS,
     render_value_timeseries
 )
-from utils_layouts import filter_layouts
+from utils_layouts import (
+    filter_layouts,
+    time_travel_layout
+)
+from utils_stats_cube import lookup_tertiles
+from utils_news import load_player_news_flags
+from utils_movers import MOVER_WINDOWS
+from utils_squad import squad_timeseries, SQUAD_METRICS
 
 # --- Page Setup ---
 st.set_page_config(layout="wide", page_title="Analisis de Mercado")
 
+# --- Session state initialization ---
+if "timeseries_players" not in st.session_state:
+    st.session_state.timeseries_players = []
+
+def select_timeseries_players(players):
+    st.session_state.timeseries_players = [p for p in players if p in unique_players]
+
 # --- Global variables ---
-player_stats_pd = load_player_stats()
+# Cold start: fetch every table this page needs at once instead of one after another
+load_concurrently({
+    "player_stats": load_player_stats,
+    "player_stats_history": lambda: load_player_stats(keep_latest=False),
+    "current_team": load_current_team_players,
+    "player_matches": load_player_matches,
+    "player_value": lambda: load_market_value(player_names=None),
+})
+
+chart_metrics = MARKET_CHART_METRICS
+player_stats_pd = load_player_stats_ranked(tuple(chart_metrics))
+stats_cube = load_stats_cube(tuple(chart_metrics))
 current_team_pd = load_current_team_players()
 
 unique_teams = sorted(player_stats_pd['team'].dropna().unique().tolist())
@@ -25,6 +61,10 @@ unique_players = sorted(player_stats_pd['player_name'].dropna().unique().tolist(
 unique_season = sorted(player_stats_pd['season'].dropna().unique().tolist(), reverse=True)
 current_team_players = sorted(current_team_pd['name'].dropna().unique().tolist())
 
+# Players mentioned in recent injury/suspension news (inverted index, no body scans here)
+player_news_flags = load_player_news_flags(tuple(unique_players))
+player_stats_pd = player_stats_pd.assign(noticias=player_stats_pd['player_name'].map(player_news_flags).fillna(""))
+
 # --- Main page ---
 st.title("Explora las tendencias de mercado")
 
@@ -37,6 +77,14 @@ with st.container(border=True):
         unique_players=unique_players
     )
 
+    # --- Point-in-time view: latest snapshot per player at the chosen date ---
+    time_travel_date = time_travel_layout(load_player_stats_history_index()["dates"])
+    if time_travel_date is not None:
+        player_stats_pd = (
+            load_player_stats_as_of(time_travel_date, tuple(chart_metrics))
+            .assign(noticias=lambda d: d['player_name'].map(player_news_flags).fillna(""))
+        )
+
     # --- Filter data based on selection ---
     if season:
         player_stats_pd = player_stats_pd[player_stats_pd['season'].isin(season)]
@@ -53,7 +101,6 @@ with st.container(border=True):
         st.write("###### Escoge las métricas a comparar:")
 
         chart_cols = st.columns([1, 1, 4])
-        chart_metrics = ['market_purchases_pct', 'market_sales_pct', 'market_usage_pct', 'ratio_purchase_sales', 'value']
         x_metric = chart_cols[0].selectbox("X-axis", chart_metrics, index=0)
         y_metric = chart_cols[1].selectbox("Y-axis", chart_metrics, index=1)
 
@@ -68,11 +115,46 @@ with st.container(border=True):
             position_colors=POSITION_COLOURS,
             show_tertiles=True,
             height=chart_height,
+            # The cube holds the latest data only; past dates compute their guides directly
+            tertiles=None if time_travel_date is not None else {
+                m: lookup_tertiles(stats_cube, m, season, position, team) for m in (x_metric, y_metric)
+            },
+            hover_extra=[f"{m}_pct_{seg}" for m in (x_metric, y_metric) for seg in ("position", "team")] + ["noticias"],
         )
 
         st.plotly_chart(fig, use_container_width=False, key="main_chart")
 
 
+with st.container(border=True):
+    st.subheader("Jugadores que mas suben y bajan")
+    st.write("###### Mayores cambios de valor por periodo (respeta los filtros de posicion y equipo)")
+
+    movers_filter_cols = st.columns([1.5, 1, 1, 2.5])
+    movers_window = movers_filter_cols[0].radio("Periodo", options=MOVER_WINDOWS, index=1, horizontal=True)
+    movers_k = movers_filter_cols[1].number_input("Numero de jugadores", min_value=1, max_value=50, value=10)
+    movers_pct = movers_filter_cols[2].checkbox("Cambio en %", value=False)
+
+    gainers_pd, losers_pd = load_top_movers(
+        window=movers_window,
+        k=movers_k,
+        pct=movers_pct,
+        positions=tuple(position),
+        teams=tuple(team),
+    )
+
+    movers_cols = st.columns(2)
+    with movers_cols[0]:
+        st.write("###### 📈 Suben")
+        st.dataframe(gainers_pd, hide_index=True, use_container_width=True)
+        st.button("Ver evolucion de los que suben", key="btn_gainers",
+                  on_click=select_timeseries_players, args=(gainers_pd['player_name'].tolist(),))
+    with movers_cols[1]:
+        st.write("###### 📉 Bajan")
+        st.dataframe(losers_pd, hide_index=True, use_container_width=True)
+        st.button("Ver evolucion de los que bajan", key="btn_losers",
+                  on_click=select_timeseries_players, args=(losers_pd['player_name'].tolist(),))
+
+
 with st.container(border=True):
     st.subheader("Evolucion del valor de mercado")
     st.write("###### Escoge jugadores a analizar")
@@ -83,6 +165,7 @@ with st.container(border=True):
         selected_players = st.multiselect(
             "Selecciona los jugadores",
             options=unique_players,
+            key="timeseries_players",
         )
 
     with timeseries_filter_cols[1]:
@@ -145,4 +228,70 @@ with st.container(border=True):
 
 
     else:
-        st.warning("No jugadores seleccionados")
\ No newline at end of file
+        st.warning("No jugadores seleccionados")
+
+
+with st.container(border=True):
+    st.subheader("Posibles subidas y bajadas de valor")
+    st.write("###### Tendencia reciente y prevision a corto plazo de todos los jugadores")
+
+    trend_filter_cols = st.columns([1, 1, 4])
+    trend_window = trend_filter_cols[0].number_input("Dias para la tendencia", min_value=3, max_value=30, value=7)
+    trend_horizon = trend_filter_cols[1].number_input("Dias a prever", min_value=1, max_value=30, value=7)
+
+    market_trends_pd = load_market_trends(window=trend_window, horizon=trend_horizon)
+    market_trends_pd = market_trends_pd[market_trends_pd['player_name'].isin(player_stats_pd['player_name'])]
+
+    trend_cols = st.columns(2)
+    with trend_cols[0]:
+        st.write("###### 📈 Posibles subidas")
+        st.dataframe(market_trends_pd.head(15), hide_index=True, use_container_width=True)
+    with trend_cols[1]:
+        st.write("###### 📉 Posibles bajadas")
+        st.dataframe(
+            market_trends_pd.dropna(subset=['forecast_change_pct']).tail(15).iloc[::-1],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+with st.container(border=True):
+    st.subheader("Mi equipo")
+    st.write("###### Valor total, cambio diario y puntos acumulados de la plantilla")
+
+    squad_filter_cols = st.columns([2, 1.5, 1])
+    with squad_filter_cols[0]:
+        rival_players = st.multiselect(
+            "Comparar con otra plantilla",
+            options=unique_players,
+            key="rival_squad_players",
+        )
+    with squad_filter_cols[1]:
+        squad_metric = st.radio("Metrica", options=SQUAD_METRICS, index=0, horizontal=True)
+
+    squads = {"Mi equipo": current_team_players}
+    if rival_players:
+        squads["Otra plantilla"] = rival_players
+
+    squad_pd = squad_timeseries(load_squad_matrices(), squads)
+
+    if squad_pd.empty:
+        st.warning("No hay datos de valor para la plantilla")
+    else:
+        latest_squad = squad_pd[squad_pd['squad'] == "Mi equipo"].iloc[-1]
+        squad_metric_cols = st.columns(3)
+        squad_metric_cols[0].metric("Valor total", f"{latest_squad['total_value']:,.0f} €",
+                                    delta=f"{latest_squad['value_change_1d']:,.0f} €")
+        squad_metric_cols[1].metric("Puntos acumulados", f"{latest_squad['cumulative_points']:.0f}")
+        squad_metric_cols[2].metric("Jugadores con valor", f"{latest_squad['players_priced']}/{len(current_team_players)}")
+
+        fig_squad = render_value_timeseries(
+            df=squad_pd,
+            title='Evolución de la plantilla',
+            date_col="date",
+            value_col=squad_metric,
+            player_col="squad",
+            height=420,
+            add_vlines=False
+        )
+        st.plotly_chart(fig_squad, use_container_width=True)
@@ -1,10 +1,12 @@
 import streamlit as st
 import os
-from io import BytesIO
-from PIL import Image
-from supabase_client.connection import get_supabase_client
-from supabase_client.utils import (
-    check_if_table_exists
+from utils_news import (
+    load_team_news,
+    load_team_news_count
+)
+from utils_crests import (
+    load_crest_thumbnail,
+    build_crest_bundle_html
 )
 
 # --- Page Setup ---
@@ -25,114 +27,81 @@ TEAMS = [
 
 CREST_DIR = "./team_crests"
 
-supabase = get_supabase_client()
-table_name = "article_for_streamlit"
-if not check_if_table_exists(supabase, table_name):
-    st.warning(f"⚠️ Table '{table_name}' does not exist.")
-
 # --- Team selector top of page ---
 # clicked_team = None
 
+# "images": one st.image per crest; "bundle": one inlined data-URI block per row
+CREST_RENDER_MODE = "images"
+
 @st.cache_data
 def load_rectangle_png(path: str, width: int = 100, height: int = 120, transparent_bg: bool = True) -> bytes | None:
     """
-    Open image, scale it down to fit inside (width, height),
-    then center it with padding so the final size is exactly (width x height).
+    Crest thumbnail of exactly (width x height), read from the pre-rendered disk cache
+    (see utils_crests.py, `python utils_crests.py` rebuilds it).
     """
-    if not os.path.exists(path):
-        return None
-
-    img = Image.open(path).convert("RGBA")
-    # Scale down preserving aspect ratio
-    img.thumbnail((width, height), Image.LANCZOS)
-    w, h = img.size
-
-    bg = (255, 255, 255, 0) if transparent_bg else (255, 255, 255, 255)
-    canvas = Image.new("RGBA", (width, height), bg)
-    canvas.paste(img, ((width - w) // 2, (height - h) // 2), img)
-
-    buf = BytesIO()
-    canvas.save(buf, format="PNG")
-    return buf.getvalue()
+    return load_crest_thumbnail(path, width=width, height=height, transparent_bg=transparent_bg)
 
 
 @st.cache_data
-def load_all_news_articles() -> dict:
-    result = supabase.table(table_name).select("*").execute()
-    if result and result.data:
-        return result.data
-    return {}
-
-# First row (10 teams)
-cols = st.columns(10)
-for i in range(10):
-    team = TEAMS[i]
-    with cols[i].container(border=True):
-        crest_path = os.path.join(CREST_DIR, f"{team}.png")
-        data = load_rectangle_png(crest_path, width=100, height=120, transparent_bg=True)
-        if data is not None:
-            st.image(data, use_container_width=True)  # render with fixed width
-        else:
-            st.write("🛡️ [Logo missing]")
-        if st.button(team, key=f"btn_{team}", use_container_width=True):
-            st.session_state.clicked_team = team
-
-# Second row (next 10 teams)
-cols = st.columns(10)
-for i in range(10, 20):
-    team = TEAMS[i]
-    with cols[i-10].container(border=True):
-        crest_path = os.path.join(CREST_DIR, f"{team}.png")
-        data = load_rectangle_png(crest_path, width=100, height=120, transparent_bg=True)
-        if data is not None:
-            st.image(data, use_container_width=True)  # render with fixed width
-        else:
-            st.write("🛡️ [Logo missing]")
-        if st.button(team, key=f"btn_{team}", use_container_width=True):
-            st.session_state.clicked_team = team
+def load_crest_bundle(teams: tuple) -> str:
+    return build_crest_bundle_html(teams, crest_dir=CREST_DIR, width=100, height=120, transparent_bg=True)
+
+
+for row_teams in (TEAMS[:10], TEAMS[10:20]):
+    if CREST_RENDER_MODE == "bundle":
+        st.html(load_crest_bundle(tuple(row_teams)))
+
+    cols = st.columns(10)
+    for i, team in enumerate(row_teams):
+        with cols[i].container(border=True):
+            if CREST_RENDER_MODE != "bundle":
+                crest_path = os.path.join(CREST_DIR, f"{team}.png")
+                data = load_rectangle_png(crest_path, width=100, height=120, transparent_bg=True)
+                if data is not None:
+                    st.image(data, use_container_width=True)  # render with fixed width
+                else:
+                    st.write("🛡️ [Logo missing]")
+            if st.button(team, key=f"btn_{team}", use_container_width=True):
+                st.session_state.clicked_team = team
 
 if st.session_state.clicked_team:
     with st.container(border=True):
-        result = load_all_news_articles()
-        team_rows = [r for r in result if r.get("team") == st.session_state.clicked_team]
-        st.success(f"Has elegido: {st.session_state.clicked_team}. Encontrados {len(team_rows)} resumenes.")
+        clicked_team = st.session_state.clicked_team
+        team_news = load_team_news(clicked_team)
+        st.success(f"Has elegido: {clicked_team}. Encontrados {load_team_news_count(clicked_team)} resumenes.")
 
         with st.container(border=True):
             with st.expander("Lesiones y sanciones..."):
-                lesiones = [r for r in team_rows if r.get("tag") == '["lesiones_sanciones"]']
+                lesiones = team_news.get((clicked_team, "lesiones_sanciones"))
 
                 if lesiones:
-                    st.write(lesiones[0]['markdown_document'])
+                    st.write(lesiones['markdown_document'])
                 else:
                     st.warning("No lesiones sanciones.")
 
         with st.container(border=True):
             with st.expander("Previa de proximos partidos..."):
-                previa = [r for r in team_rows if r.get("tag") == '["previa_siguiente_partido"]']
+                previa = team_news.get((clicked_team, "previa_siguiente_partido"))
 
                 if previa:
-                    st.write(previa[0]['markdown_document'])
+                    st.write(previa['markdown_document'])
                 else:
                     st.warning("No previa siguiente partido.")
 
         with st.container(border=True):
             with st.expander("Cronicas de partidos anteriores..."):
-                cronicas = [r for r in team_rows if r.get("tag") == '["cronica_partido"]']
+                cronicas = team_news.get((clicked_team, "cronica_partido"))
 
                 if cronicas:
-                    st.write(cronicas[0]['markdown_document'])
+                    st.write(cronicas['markdown_document'])
                 else:
                     st.warning("No cronicas de partidos.")
 
         with st.container(border=True):
             with st.expander("Fichajes..."):
-                fichajes = [r for r in team_rows if ((r.get("tag") == '["fichajes"]') or (r.get("tag") == '["renovaciones"]'))]
+                fichajes = team_news.get((clicked_team, "fichajes"))
 
                 if fichajes:
-                    st.write(fichajes[0]['markdown_document'])
+                    st.write(fichajes['markdown_document'])
                 else:
                     st.warning("No fichajes o renovaciones.")
-
-
-
-
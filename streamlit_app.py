@@ -1,5 +1,39 @@
 import streamlit as st
+from utils_warmup import start_warmup
+from supabase_client.connection import get_request_metrics
 
 st.set_page_config(page_title="Biwenger Fantasy Optimizer", layout="wide")
 st.title("📊 Biwenger Fantasy Optimizer")
 st.markdown("Bienvenidos a la herramienta de análisis de fútbol fantasy! Usa la barra lateral para navegar.")
+
+# --- Cache warm-up (background thread, once per server process) ---
+warmup_state = start_warmup()
+warmup_running = warmup_state["status"] != "done"
+
+
+@st.fragment(run_every=1 if warmup_running else None)
+def render_warmup_progress():
+    if warmup_state["status"] != "done":
+        total = max(warmup_state["total"], 1)
+        st.progress(
+            warmup_state["done"] / total,
+            text=f"Preparando datos... {warmup_state['current'] or ''} ({warmup_state['done']}/{warmup_state['total']})",
+        )
+        return
+
+    if warmup_running:
+        # Full rerun once so the fragment stops polling
+        st.rerun()
+
+    st.caption(f"✅ Datos listos (precarga en {warmup_state['duration_s']}s)")
+    request_metrics = get_request_metrics()
+    st.caption(
+        f"🌐 {request_metrics['requests']} peticiones a Supabase, "
+        f"{request_metrics['retries']} reintentos, {request_metrics['errors']} errores, "
+        f"{request_metrics['bytes'] / 1e6:.1f} MB"
+    )
+    for label, error in warmup_state["errors"]:
+        st.warning(f"⚠️ Fallo al precargar '{label}': {error}")
+
+
+render_warmup_progress()
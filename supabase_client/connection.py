@@ -1,15 +1,178 @@
 import os
+import time
+import random
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional
+import httpx
 import toml
-from supabase import create_client, Client
 
+if TYPE_CHECKING:
+    from supabase import Client
 
-def get_supabase_client(secrets_path_override: str = None) -> Client:
+
+# --- HTTP transport ---
+REQUEST_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+MAX_RETRIES = 4
+BACKOFF_BASE_S = 0.25
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_http_transport: Optional["RetryTransport"] = None
+_http_transport_lock = threading.Lock()
+
+_metrics_lock = threading.Lock()
+_recent_requests: deque = deque(maxlen=500)
+_request_totals = {"requests": 0, "retries": 0, "errors": 0, "elapsed_ms": 0.0, "bytes": 0}
+_tracked = threading.local()
+
+
+def _record_request(record: Dict) -> None:
+    with _metrics_lock:
+        _recent_requests.append(record)
+        _request_totals["requests"] += 1
+        _request_totals["retries"] += record["retries"]
+        _request_totals["errors"] += int(record["error"] is not None or record["status"] >= 400)
+        _request_totals["elapsed_ms"] += record["elapsed_ms"]
+        _request_totals["bytes"] += record["bytes"]
+
+    collector = getattr(_tracked, "records", None)
+    if collector is not None:
+        collector.append(record)
+
+
+def get_request_metrics() -> Dict:
+    """
+    Process-wide totals plus the most recent requests (method, path, status,
+    elapsed_ms, bytes on the wire, retries, error).
+    """
+    with _metrics_lock:
+        return {**_request_totals, "recent": list(_recent_requests)}
+
+
+def summarize_requests(records: List[Dict]) -> Dict:
+    return {
+        "requests": len(records),
+        "retries": sum(r["retries"] for r in records),
+        "elapsed_ms": round(sum(r["elapsed_ms"] for r in records), 1),
+        "bytes": sum(r["bytes"] for r in records),
+    }
+
+
+@contextmanager
+def track_requests():
+    """
+    Collect the requests made by this thread inside the block:
+
+        with track_requests() as records:
+            ...
+        summarize_requests(records)
+    """
+    previous = getattr(_tracked, "records", None)
+    _tracked.records = []
+    try:
+        yield _tracked.records
+    finally:
+        _tracked.records = previous
+
+
+class RetryTransport(httpx.HTTPTransport):
+    """
+    Pooled keep-alive transport that retries a single idempotent request with
+    exponential backoff and jitter on connection errors, timeouts and 408/429/5xx,
+    so one transient failure doesn't abort a whole paged fetch. Every request is
+    recorded in the request metrics.
+    """
+
+    def __init__(self, *args, max_retries: int = MAX_RETRIES, backoff_base_s: float = BACKOFF_BASE_S, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+
+    def _sleep(self, attempt: int, response: Optional[httpx.Response] = None) -> None:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = self.backoff_base_s * (2 ** attempt) * (0.5 + random.random())
+        time.sleep(delay)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        retryable = request.method in IDEMPOTENT_METHODS
+        start = time.perf_counter()
+        attempt = 0
+
+        while True:
+            try:
+                response = super().handle_request(request)
+            except httpx.TransportError as e:
+                if not retryable or attempt >= self.max_retries:
+                    _record_request({
+                        "method": request.method, "path": request.url.path, "status": 0,
+                        "elapsed_ms": (time.perf_counter() - start) * 1000, "bytes": 0,
+                        "retries": attempt, "error": repr(e),
+                    })
+                    raise
+                self._sleep(attempt)
+                attempt += 1
+                continue
+
+            if retryable and response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                response.close()
+                self._sleep(attempt, response)
+                attempt += 1
+                continue
+
+            _record_request({
+                "method": request.method, "path": request.url.path, "status": response.status_code,
+                "elapsed_ms": (time.perf_counter() - start) * 1000,
+                # Compressed size when the server sent one (gzip keeps paged JSON small)
+                "bytes": int(response.headers.get("Content-Length", 0) or 0),
+                "retries": attempt, "error": None,
+            })
+            return response
+
+
+def get_http_transport() -> RetryTransport:
+    """
+    Shared transport for every HTTP client of the process: one connection pool with
+    keep-alive and HTTP/2, and retries.
+    """
+    global _http_transport
+    with _http_transport_lock:
+        if _http_transport is None:
+            _http_transport = RetryTransport(http2=True, limits=POOL_LIMITS)
+        return _http_transport
+
+
+def new_http_client() -> httpx.Client:
+    """
+    HTTP client for one Supabase client, sending through the shared pooled transport
+    with gzip negotiation and per-request timeouts. Never share it between Supabase
+    clients: postgrest and storage set their own base_url and headers on the client
+    they are given. Closing it closes the shared pool.
+    """
+    return httpx.Client(
+        transport=get_http_transport(),
+        timeout=REQUEST_TIMEOUT,
+        headers={"Accept-Encoding": "gzip, deflate"},
+    )
+
+
+def get_supabase_client(secrets_path_override: str = None, http_client: Optional[httpx.Client] = None) -> "Client":
     """
     Loads Supabase credentials and returns an authenticated client instance.
     Optionally accepts a custom path for secrets file (for testing).
+    Requests go through a new client on the shared pooled transport unless
+    http_client is given.
     """
     if secrets_path_override:
         secrets_path = secrets_path_override
+    elif os.environ.get("BIWENGER_SUPABASE_SECRETS"):
+        # e.g. the offline stub of load_test.py
+        secrets_path = os.environ["BIWENGER_SUPABASE_SECRETS"]
     else:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         root_dir = os.path.abspath(os.path.join(current_dir, ".."))
@@ -25,7 +188,15 @@ def get_supabase_client(secrets_path_override: str = None) -> Client:
     if not url or not key:
         raise KeyError("Missing 'url' or 'anon_key' in supabase.toml")
 
-    return create_client(url, key)
+    # Imported here: the supabase package (realtime, storage, auth...) is slow to import
+    # and only needed once the first query is made
+    from supabase import create_client, ClientOptions
+
+    options = ClientOptions(
+        httpx_client=http_client or new_http_client(),
+        postgrest_client_timeout=REQUEST_TIMEOUT,
+    )
+    return create_client(url, key, options=options)
 
 
 if __name__ == "__main__":
@@ -40,6 +211,7 @@ if __name__ == "__main__":
             result = supabase.table("article_for_streamlit").select("*").limit(1).execute()
             print("📦 Sample query from 'articles' table succeeded.")
             pprint(result.data)
+            pprint(summarize_requests(get_request_metrics()["recent"]))
         except Exception as query_err:
             print("⚠️ Connection OK, but table query failed (maybe table doesn't exist yet):")
             print(query_err)
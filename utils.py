@@ -1,31 +1,81 @@
-from supabase_client.connection import get_supabase_client
+from supabase_client.connection import (
+    get_supabase_client,
+    track_requests,
+    summarize_requests
+)
 from supabase_client.utils import (
     check_if_table_exists
 )
+from utils_stats_cube import (
+    build_stats_cube,
+    add_segment_ranks
+)
+from utils_similarity import build_similarity_index
+from utils_market_trends import (
+    build_value_matrix,
+    compute_market_trends
+)
+from utils_movers import (
+    build_latest_changes,
+    top_movers
+)
+from utils_snapshot import (
+    load_snapshot_table,
+    snapshot_first,
+    snapshot_versioned
+)
+from utils_squad import build_squad_matrices
+from utils_form import (
+    new_form_state,
+    update_form_state,
+    form_metrics,
+    refresh_since
+)
+from utils_pipeline import get_pipeline_engine
+from utils_timeline import (
+    build_history_index,
+    snapshot_as_of
+)
 import streamlit as st
+import logging
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import numpy as np
-from typing import Dict, Iterable, Optional, List, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, List, Any
 
 
-supabase = get_supabase_client()
 player_stats_table_name = "biwenger_player_stats"
-if not check_if_table_exists(supabase, player_stats_table_name):
-    st.warning(f"⚠️ Table '{player_stats_table_name}' does not exist.")
-
 current_team_table_name = "biwenger_current_team"
-if not check_if_table_exists(supabase, current_team_table_name):
-    st.warning(f"⚠️ Table '{current_team_table_name}' does not exist.")
-
 player_value_table_name = "biwenger_player_value"
-if not check_if_table_exists(supabase, player_value_table_name):
-    st.warning(f"⚠️ Table '{player_value_table_name}' does not exist.")
-
 player_matches_table_name = "biwenger_player_matches"
-if not check_if_table_exists(supabase, player_matches_table_name):
-    st.warning(f"⚠️ Table '{player_matches_table_name}' does not exist.")
 
-def fetch_all_rows_from_supabase(
+logger = logging.getLogger(__name__)
+
+_supabase = None
+_supabase_lock = threading.Lock()
+
+
+def get_supabase():
+    """
+    Supabase client, created (and the tables checked) on the first query instead of at
+    import time, so importing a page never waits on the network.
+    """
+    global _supabase
+    with _supabase_lock:
+        if _supabase is None:
+            client = get_supabase_client()
+            for table_name in (player_stats_table_name, current_team_table_name,
+                               player_value_table_name, player_matches_table_name):
+                if not check_if_table_exists(client, table_name):
+                    st.warning(f"⚠️ Table '{table_name}' does not exist.")
+                    # st.warning is dropped outside a session (e.g. the warm-up thread)
+                    logger.warning("Table '%s' does not exist", table_name)
+            _supabase = client
+    return _supabase
+
+
+def fetch_rows_from_supabase(
     table_name: str,
     select: str = "*",
     page_size: int = 1000,           # <= Supabase/PostgREST per-request cap
@@ -33,85 +83,148 @@ def fetch_all_rows_from_supabase(
     ascending: bool = True,
     eq_filters: Optional[Dict[str, Any]] = None,
     in_filters: Optional[Dict[str, Iterable[Any]]] = None,
-    drop_columns: Optional[List[str]] = None,
-) -> pd.DataFrame:
+    gt_filters: Optional[Dict[str, Any]] = None,
+    gte_filters: Optional[Dict[str, Any]] = None,
+) -> tuple[List[dict], Dict[str, Any]]:
+    """
+    Raw rows of every page plus the request metrics of the fetch, so each pipeline
+    engine (utils_pipeline) can build its own frame from them.
+    """
     rows: List[dict] = []
     start = 0
 
-    while True:
-        query = supabase.table(table_name).select(select)
+    # Failed pages are retried on their own by the transport (supabase_client/connection.py)
+    with track_requests() as requests_made:
+        while True:
+            query = get_supabase().table(table_name).select(select)
+
+            if eq_filters:
+                for col, val in eq_filters.items():
+                    query = query.eq(col, val)
+            if in_filters:
+                for col, values in in_filters.items():
+                    query = query.in_(col, list(values))
+            if gt_filters:
+                for col, val in gt_filters.items():
+                    query = query.gt(col, val)
+            if gte_filters:
+                for col, val in gte_filters.items():
+                    query = query.gte(col, val)
+
+            if order_by:
+                query = query.order(order_by, desc=not ascending)
 
-        if eq_filters:
-            for col, val in eq_filters.items():
-                query = query.eq(col, val)
-        if in_filters:
-            for col, values in in_filters.items():
-                query = query.in_(col, list(values))
+            res = query.range(start, start + page_size - 1).execute()
+            data = getattr(res, "data", None) or []
 
-        if order_by:
-            query = query.order(order_by, desc=not ascending)
+            if not data:
+                break
 
-        res = query.range(start, start + page_size - 1).execute()
-        data = getattr(res, "data", None) or []
+            rows.extend(data)
+            start += page_size  # move to next window
 
-        if not data:
-            break
+            # keep looping; don't stop just because the API capped the batch
+            # we stop only when an empty page is returned
 
-        rows.extend(data)
-        start += page_size  # move to next window
+    return rows, summarize_requests(requests_made)
 
-        # keep looping; don't stop just because the API capped the batch
-        # we stop only when an empty page is returned
 
+def fetch_all_rows_from_supabase(
+    table_name: str,
+    select: str = "*",
+    page_size: int = 1000,           # <= Supabase/PostgREST per-request cap
+    order_by: Optional[str] = None,
+    ascending: bool = True,
+    eq_filters: Optional[Dict[str, Any]] = None,
+    in_filters: Optional[Dict[str, Iterable[Any]]] = None,
+    drop_columns: Optional[List[str]] = None,
+    gt_filters: Optional[Dict[str, Any]] = None,
+    gte_filters: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    rows, request_metrics = fetch_rows_from_supabase(
+        table_name, select, page_size, order_by, ascending, eq_filters, in_filters,
+        gt_filters=gt_filters, gte_filters=gte_filters
+    )
     if not rows:
         return pd.DataFrame()
 
     df = pd.DataFrame(rows)
     if drop_columns:
         df = df.drop(columns=[c for c in drop_columns if c in df.columns], errors="ignore")
+    df.attrs["request_metrics"] = request_metrics
     return df
 
 
+def load_concurrently(loaders: Dict[str, Callable[[], Any]], max_workers: int = 8) -> Dict[str, Any]:
+    """
+    Start every (independent) loader at the same time and wait for all of them,
+    so a cold page load costs about the slowest table instead of the sum.
+    Cached loaders fill their st.cache_data entries, later calls on the page are hits.
+    """
+    if not loaders:
+        return {}
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def _run(loader: Callable[[], Any]) -> Any:
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return loader()
+
+    # Workers named after the calling thread, so their log records can be told apart
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(loaders)),
+                            thread_name_prefix=threading.current_thread().name) as pool:
+        futures = {name: pool.submit(_run, loader) for name, loader in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+@snapshot_first(lambda keep_latest: "player_stats" if keep_latest else "player_stats_history")
 @st.cache_data
 def load_player_stats(keep_latest=True) -> pd.DataFrame:
-    df = fetch_all_rows_from_supabase(
+    rows, request_metrics = fetch_rows_from_supabase(
         table_name=player_stats_table_name,
         select="*",                # or list the exact columns for performance
         page_size=1000,
         order_by="player_name",    # optional but helps deterministic paging
         ascending=True,
-        drop_columns=["id", "created_at"]
     )
-    if df.empty:
-        return df
+    if not rows:
+        return pd.DataFrame()
 
-    df['as_of_date'] = pd.to_datetime(df['as_of_date'])
+    engine = get_pipeline_engine()
+    df = engine.enrich_player_stats(engine.frame_from_rows(rows, drop_columns=["id", "created_at"]), keep_latest=keep_latest)
+    df.attrs["request_metrics"] = request_metrics
+    return df
 
-    if keep_latest:
-        # Sort so newest per player is first, then drop duplicates
-        df = df.sort_values(["player_name", "as_of_date"], ascending=[True, False])
-        df_latest = df.drop_duplicates(subset=["player_name"], keep="first").reset_index(drop=True)
-    else:
-        df_latest = df
-
-    # Your existing enrichments
-    return (
-        df_latest.assign(
-            points_per_value=lambda d: np.round(
-                np.maximum(0, d["points"] / d["value"].replace(0, pd.NA)) * 100_000, 2
-            ),
-            ratio_purchase_sales=lambda d: np.round(
-                np.maximum(0, d["market_purchases_pct"] / d["market_sales_pct"]).replace(0, pd.NA), 2
-            ),
-            position=lambda d: d["position"].map({
-                "Defender": "2 - Defensa",
-                "Forward": "4 - Delantero",
-                "Goalkeeper": "1 - Portero",
-                "Midfielder": "3 - Centrocampista",
-            }),
-        )
-    )
+@snapshot_versioned
+@st.cache_data
+def load_stats_cube(metrics: tuple[str, ...], snapshot_version=None) -> pd.DataFrame:
+    # Built once per load_player_stats cache entry; filter changes only do .loc lookups
+    return build_stats_cube(load_player_stats(), metrics)
+
+@snapshot_versioned
+@st.cache_data
+def load_player_stats_ranked(metrics: tuple[str, ...], snapshot_version=None) -> pd.DataFrame:
+    return add_segment_ranks(load_player_stats(), metrics)
+
+@snapshot_versioned
+@st.cache_resource
+def load_player_stats_history_index(snapshot_version=None) -> dict:
+    # (player, as_of_date) index over the full history, shared read-only across sessions
+    return build_history_index(load_player_stats(keep_latest=False))
+
+@snapshot_versioned
+@st.cache_data
+def load_player_stats_as_of(as_of_date, metrics: tuple[str, ...], snapshot_version=None) -> pd.DataFrame:
+    return add_segment_ranks(snapshot_as_of(load_player_stats_history_index(), as_of_date), metrics)
+
+@snapshot_versioned
+@st.cache_resource
+def load_similarity_index(snapshot_version=None) -> dict:
+    # Standardized feature matrix, shared across sessions (read-only)
+    return build_similarity_index(load_player_stats())
 
+@snapshot_first("current_team")
 @st.cache_data
 def load_current_team_players() -> pd.DataFrame:
     return fetch_all_rows_from_supabase(
@@ -123,94 +236,129 @@ def load_current_team_players() -> pd.DataFrame:
         drop_columns=["id", "created_at"]
     )
 
+@snapshot_first("player_matches")
 @st.cache_data
 def load_player_matches() -> pd.DataFrame:
-    df = fetch_all_rows_from_supabase(
+    rows, request_metrics = fetch_rows_from_supabase(
         table_name=player_matches_table_name,
         select="*",
         page_size=1000,
         order_by="player_name",
         ascending=True,
-        drop_columns=["id", "created_at"]
     )
-    df['match_date'] = pd.to_datetime(df['match_date'])
+    if not rows:
+        return pd.DataFrame()
 
+    engine = get_pipeline_engine()
+    df = engine.enrich_player_matches(engine.frame_from_rows(rows, drop_columns=["id", "created_at"]))
+    df.attrs["request_metrics"] = request_metrics
     return df
 
+@st.cache_resource
+def get_player_form_state() -> dict:
+    # Rolling per-player buffers, updated in place as new match rows arrive
+    return new_form_state()
+
+def load_player_matches_since(since: pd.Timestamp) -> pd.DataFrame:
+    """
+    Match rows on or after `since`: from the current snapshot when there is one,
+    else one filtered Supabase query. Rows already applied are skipped by update_form_state.
+    """
+    snapshot = load_snapshot_table("player_matches")
+    if snapshot is not None:
+        return snapshot[snapshot["match_date"] >= since]
+
+    new_matches = fetch_all_rows_from_supabase(
+        table_name=player_matches_table_name,
+        select="*",
+        page_size=1000,
+        order_by="player_name",
+        ascending=True,
+        gte_filters={"match_date": since.isoformat()},
+        drop_columns=["id", "created_at"]
+    )
+    if not new_matches.empty:
+        new_matches['match_date'] = pd.to_datetime(new_matches['match_date'])
+    return new_matches
+
+@snapshot_versioned
+@st.cache_data(ttl=600)
+def load_player_form(snapshot_version=None) -> pd.DataFrame:
+    state = get_player_form_state()
+    since = refresh_since(state)
+    if since is None:
+        update_form_state(state, load_player_matches())
+    else:
+        # Only the last days are re-read; rows already applied per player are skipped
+        update_form_state(state, load_player_matches_since(since))
+    return form_metrics(state)
+
+@snapshot_first("player_value", player_filter_arg="player_names")
 @st.cache_data
 def load_market_value(player_names=None) -> pd.DataFrame:
     in_filters = {"player_name": player_names} if player_names else None
-    df = fetch_all_rows_from_supabase(
+    rows, request_metrics = fetch_rows_from_supabase(
         table_name=player_value_table_name,
         select="*",
         page_size=1000,
         order_by="player_name",
         ascending=True,
         in_filters=in_filters,
-        drop_columns=["id", "created_at"]
     )
-    if df.empty:
-        return df
-
-    # Convert date and compute your time-series features
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values(["player_name", "date"]).reset_index(drop=True)
-
-    df = (
-        df.groupby("player_name", group_keys=False)
-        .apply(lambda g: g.assign(
-            value_change_1d=g["market_value_eur"].diff(),
-            value_change_1d_pct=g["market_value_eur"].pct_change() * 100,
-            value_change_7d=g["market_value_eur"].diff(periods=7),
-            value_change_7d_pct=g["market_value_eur"].pct_change(periods=7) * 100,
-            value_change_30d=g["market_value_eur"].diff(periods=30),
-            value_change_30d_pct=g["market_value_eur"].pct_change(periods=30) * 100,
-            value_avg_7d=g["market_value_eur"].rolling(window=7, min_periods=1).mean(),
-            value_avg_14d=g["market_value_eur"].rolling(window=14, min_periods=1).mean(),
-            value_avg_30d=g["market_value_eur"].rolling(window=30, min_periods=1).mean(),
-        ))
-        .reset_index(drop=True)
-    )
-
-    df['date'] = pd.to_datetime(df['date'])
+    if not rows:
+        return pd.DataFrame()
 
-    return df.sort_values(["player_name", "date"], ascending=[True, False])
+    engine = get_pipeline_engine()
+    df = engine.enrich_market_value(engine.frame_from_rows(rows, drop_columns=["id", "created_at"]))
+    df.attrs["request_metrics"] = request_metrics
+    return df
 
+@snapshot_versioned
 @st.cache_data
-def join_data(player_names=None):
-    player_stats_pd = (
-        load_player_stats(keep_latest=False)
-        .drop(columns=['season', 'position', 'team', 'status_detail', 'min_value', 'max_value', 'value'])
-        .rename(columns={'points': 'total_points',
-                         'average': 'points_per_game'},
-                )
-    )
+def load_value_matrix(snapshot_version=None) -> pd.DataFrame:
+    return build_value_matrix(load_market_value())
 
-    player_matches_pd = (
-        load_player_matches()
-        .drop(columns=['season_label', 'best_xi', 'events', 'team', 'as_of_date'])
-    )
-
-    player_value_pd = load_market_value(player_names=player_names)
-
-    full_data = pd.merge(
-        player_value_pd,
-        player_matches_pd,
-        left_on=['player_name', 'date'],
-        right_on=['player_name', 'match_date'],
-        how='left'
-    )
+@snapshot_versioned
+@st.cache_data
+def load_market_trends(window: int = 7, horizon: int = 7, snapshot_version=None) -> pd.DataFrame:
+    # Every player at once on the cached player x date matrix
+    return compute_market_trends(load_value_matrix(), window=window, horizon=horizon)
+
+@snapshot_versioned
+@st.cache_resource
+def load_squad_matrices(snapshot_version=None) -> dict:
+    # Player x date value/points matrices behind the squad dashboard, read-only and shared
+    return build_squad_matrices(load_value_matrix(), load_player_matches())
+
+@snapshot_versioned
+@st.cache_resource
+def load_latest_changes(snapshot_version=None) -> dict:
+    # Latest value_change_* row per player as a dense matrix, read-only and shared
+    return build_latest_changes(load_market_value(), load_player_stats())
+
+@snapshot_versioned
+@st.cache_data
+def load_top_movers(window: str = "7d", k: int = 10, pct: bool = False,
+                    positions: tuple = (), teams: tuple = (),
+                    snapshot_version=None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return top_movers(load_latest_changes(), window=window, k=k, pct=pct, positions=positions, teams=teams)
 
-    full_data = pd.merge(
-        full_data,
-        player_stats_pd,
-        left_on=['player_name', 'date'],
-        right_on=['player_name', 'as_of_date'],
-        how='left',
+@snapshot_first("timeline", player_filter_arg="player_names")
+@st.cache_data
+def join_data(player_names=None):
+    tables = load_concurrently({
+        "player_stats": lambda: load_player_stats(keep_latest=False),
+        "player_matches": load_player_matches,
+        "player_value": lambda: load_market_value(player_names=player_names or None),
+    })
+
+    # Latest match and stats snapshot at or before each value date
+    return get_pipeline_engine().join_timeline(
+        tables["player_value"],
+        tables["player_matches"],
+        tables["player_stats"],
     )
 
-    return full_data
-
 # res = supabase.table(player_value_table_name).select("*", count="exact").range(0,0).execute()
 # total = getattr(res, "count", None)
 # print(f"ℹ️ Table '{player_value_table_name}' has approximately {total} rows.")
\ No newline at end of file
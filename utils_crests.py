@@ -0,0 +1,132 @@
+import os
+import base64
+import hashlib
+from io import BytesIO
+from typing import Iterable, Optional
+
+
+CREST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "team_crests")
+THUMBNAIL_DIR = os.path.join(CREST_DIR, "thumbnails")
+
+# (width, height, transparent_bg) used by the pages
+CREST_SIZES = [(100, 120, True)]
+
+
+def _content_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def thumbnail_path(path: str, width: int, height: int, transparent_bg: bool, thumbnail_dir: Optional[str] = None) -> str:
+    """
+    Cache file for a crest at a size, keyed by the content hash of the source PNG,
+    so replacing a crest never serves a stale thumbnail. Thumbnails live in a
+    "thumbnails" folder next to the crest unless `thumbnail_dir` is given.
+    """
+    thumbnail_dir = thumbnail_dir or os.path.join(os.path.dirname(path), "thumbnails")
+    bg = "t" if transparent_bg else "w"
+    return os.path.join(thumbnail_dir, f"{_content_hash(path)}_{width}x{height}_{bg}.png")
+
+
+def render_crest_thumbnail(path: str, width: int = 100, height: int = 120, transparent_bg: bool = True) -> bytes:
+    """
+    Open image, scale it down to fit inside (width, height),
+    then center it with padding so the final size is exactly (width x height).
+    """
+    from PIL import Image
+
+    img = Image.open(path).convert("RGBA")
+    # Scale down preserving aspect ratio
+    img.thumbnail((width, height), Image.LANCZOS)
+    w, h = img.size
+
+    bg = (255, 255, 255, 0) if transparent_bg else (255, 255, 255, 255)
+    canvas = Image.new("RGBA", (width, height), bg)
+    canvas.paste(img, ((width - w) // 2, (height - h) // 2), img)
+
+    buf = BytesIO()
+    canvas.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def load_crest_thumbnail(path: str, width: int = 100, height: int = 120, transparent_bg: bool = True,
+                         thumbnail_dir: Optional[str] = None) -> bytes | None:
+    """
+    Pre-rendered thumbnail bytes from the disk cache. Only renders (and stores)
+    it when the cache has no entry for this crest content and size.
+    """
+    if not os.path.exists(path):
+        return None
+
+    cached = thumbnail_path(path, width, height, transparent_bg, thumbnail_dir)
+    if os.path.exists(cached):
+        with open(cached, "rb") as f:
+            return f.read()
+
+    data = render_crest_thumbnail(path, width, height, transparent_bg)
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        with open(cached, "wb") as f:
+            f.write(data)
+    except OSError:
+        # Read-only deployments still get the rendered bytes
+        pass
+    return data
+
+
+def build_crest_thumbnails(crest_dir: str = CREST_DIR, sizes: Iterable[tuple] = tuple(CREST_SIZES),
+                           thumbnail_dir: Optional[str] = None) -> list[str]:
+    """
+    Pre-render every crest at every size and drop thumbnails of crests that changed.
+    Only `thumbnail_dir` (default: crest_dir/thumbnails) is written and pruned.
+    """
+    sizes = list(sizes)
+    thumbnail_dir = thumbnail_dir or os.path.join(crest_dir, "thumbnails")
+    os.makedirs(thumbnail_dir, exist_ok=True)
+
+    built = []
+    for file_name in sorted(os.listdir(crest_dir)):
+        path = os.path.join(crest_dir, file_name)
+        if not file_name.lower().endswith(".png") or not os.path.isfile(path):
+            continue
+        for width, height, transparent_bg in sizes:
+            load_crest_thumbnail(path, width, height, transparent_bg, thumbnail_dir)
+            built.append(thumbnail_path(path, width, height, transparent_bg, thumbnail_dir))
+
+    for file_name in os.listdir(thumbnail_dir):
+        stale = os.path.join(thumbnail_dir, file_name)
+        if stale not in built:
+            os.remove(stale)
+    return built
+
+
+def build_crest_bundle_html(
+    teams: Iterable[str],
+    crest_dir: str = CREST_DIR,
+    width: int = 100,
+    height: int = 120,
+    transparent_bg: bool = True,
+) -> str:
+    """
+    One HTML block with every crest inlined as a data URI, so a whole row of crests
+    is sent to the browser as a single payload instead of one image per team.
+    """
+    cells = []
+    for team in teams:
+        data = load_crest_thumbnail(os.path.join(crest_dir, f"{team}.png"), width, height, transparent_bg)
+        if data is None:
+            cells.append(f'<div title="{team}">🛡️</div>')
+            continue
+        uri = "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+        cells.append(f'<img src="{uri}" alt="{team}" title="{team}" style="width:100%;max-width:{width}px;">')
+
+    return (
+        '<div style="display:grid;grid-template-columns:repeat(10, 1fr);gap:1rem;justify-items:center;">'
+        + "".join(cells)
+        + "</div>"
+    )
+
+
+if __name__ == "__main__":
+    built = build_crest_thumbnails()
+    print(f"✅ {len(built)} crest thumbnails in {THUMBNAIL_DIR}")
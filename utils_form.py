@@ -0,0 +1,173 @@
+import pandas as pd
+import numpy as np
+import threading
+from typing import Any, Dict, Optional
+
+from utils_market_trends import rolling_ols_slope
+
+
+FORM_WINDOW = 5
+FORM_METRICS = ["form_points", "form_avg", "form_std", "form_minutes_trend", "form_matches"]
+MINUTES_COLUMNS = ["minutes_played", "minutes", "mins"]
+# Incremental refreshes re-read this many days before the newest applied match, so
+# rows stored late for players whose own last match is older are still picked up
+FORM_REFRESH_OVERLAP_DAYS = 14
+
+
+def new_form_state(window: int = FORM_WINDOW) -> Dict[str, Any]:
+    """
+    Per-player state: the last `window` matches as right-aligned (players x window)
+    buffers (NaN padded) plus the date of the last match applied.
+    """
+    return {
+        "window": window,
+        "players": pd.Index([], dtype=object),
+        "points": np.empty((0, window)),
+        "minutes": np.empty((0, window)),
+        "last_date": np.empty(0, dtype="datetime64[ns]"),
+        "lock": threading.Lock(),
+    }
+
+
+def _grow(state: Dict[str, Any], players: pd.Index) -> None:
+    new = players.difference(state["players"])
+    if new.empty:
+        return
+    window = state["window"]
+    state["players"] = state["players"].append(new)
+    state["points"] = np.vstack([state["points"], np.full((new.size, window), np.nan)])
+    state["minutes"] = np.vstack([state["minutes"], np.full((new.size, window), np.nan)])
+    state["last_date"] = np.concatenate([state["last_date"], np.full(new.size, np.datetime64("NaT"), dtype="datetime64[ns]")])
+
+
+def _push(buffer: np.ndarray, rows: np.ndarray, counts: np.ndarray, slots: np.ndarray, values: np.ndarray) -> None:
+    """
+    Append values to the right end of the given buffer rows in one scatter:
+    old entries shift left by each row's count, the oldest fall off.
+    """
+    window = buffer.shape[1]
+    k = int(counts.max())
+    wide = np.full((rows.size, window + k), np.nan)
+
+    old_cols = (k - counts)[:, None] + np.arange(window)[None, :]
+    wide[np.arange(rows.size)[:, None], old_cols] = buffer[rows]
+    wide[slots[0], window + k - counts[slots[0]] + slots[1]] = values
+
+    buffer[rows] = wide[:, -window:]
+
+
+def update_form_state(
+    state: Dict[str, Any],
+    matches: pd.DataFrame,
+    player_col: str = "player_name",
+    date_col: str = "match_date",
+    points_col: str = "points",
+) -> int:
+    """
+    Apply only the match rows newer than each player's last applied match, once per
+    (player, match date) even if rows are repeated or re-read by an overlapping fetch.
+    Cost is proportional to the new rows, not the season.
+
+    Returns:
+        Number of match rows applied.
+    """
+    if matches.empty:
+        return 0
+
+    minutes_col = next((c for c in MINUTES_COLUMNS if c in matches.columns), None)
+
+    with state["lock"]:
+        _grow(state, pd.Index(matches[player_col].dropna().unique()))
+
+        rows = state["players"].get_indexer(matches[player_col])
+        dates = matches[date_col].to_numpy(dtype="datetime64[ns]")
+        last = state["last_date"][np.maximum(rows, 0)]
+        fresh = (rows >= 0) & ~np.isnat(dates) & (np.isnat(last) | (dates > last))
+        if not fresh.any():
+            return 0
+
+        new = pd.DataFrame({
+            "row": rows[fresh],
+            "date": dates[fresh],
+            "points": pd.to_numeric(matches[points_col], errors="coerce").to_numpy(dtype="float64")[fresh],
+            "minutes": (pd.to_numeric(matches[minutes_col], errors="coerce").to_numpy(dtype="float64")[fresh]
+                        if minutes_col else np.nan),
+        }).sort_values(["row", "date"], kind="stable").drop_duplicates(["row", "date"], keep="last")
+        applied = len(new)
+
+        # Keep at most `window` new matches per player, they are all that can survive
+        new = new.groupby("row", sort=False).tail(state["window"])
+        slot = new.groupby("row", sort=False).cumcount().to_numpy()
+        affected, position, counts = np.unique(new["row"].to_numpy(), return_inverse=True, return_counts=True)
+
+        for key in ("points", "minutes"):
+            _push(state[key], affected, counts, (position, slot), new[key].to_numpy())
+        state["last_date"][affected] = new.groupby("row")["date"].max().to_numpy()
+        return applied
+
+
+def form_metrics(state: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Form of every player from the current buffers (vectorized over players).
+    """
+    with state["lock"]:
+        points, minutes = state["points"].copy(), state["minutes"].copy()
+        players = state["players"]
+
+    played = ~np.isnan(points)
+    n = played.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = np.where(n > 0, np.nansum(points, axis=1), np.nan)
+        avg = total / np.where(n > 0, n, np.nan)
+        std = np.sqrt(np.nansum((points - avg[:, None]) ** 2, axis=1) / np.where(n > 1, n - 1, np.nan))
+
+    minutes_trend = (rolling_ols_slope(minutes, minutes.shape[1])[:, -1]
+                     if minutes.shape[1] >= 2 and minutes.shape[0] else np.full(players.size, np.nan))
+
+    return pd.DataFrame({
+        "player_name": players.to_numpy(),
+        "form_points": np.round(total, 2),
+        "form_avg": np.round(avg, 2),
+        "form_std": np.round(std, 2),
+        "form_minutes_trend": np.round(minutes_trend, 2),
+        "form_matches": n,
+    })
+
+
+def latest_applied_date(state: Dict[str, Any]) -> Optional[pd.Timestamp]:
+    with state["lock"]:
+        if state["last_date"].size == 0 or np.isnat(state["last_date"]).all():
+            return None
+        return pd.Timestamp(np.nanmax(state["last_date"]))
+
+
+def refresh_since(state: Dict[str, Any], overlap_days: int = FORM_REFRESH_OVERLAP_DAYS) -> Optional[pd.Timestamp]:
+    # Start of the next incremental read (None = nothing applied yet, read everything)
+    latest = latest_applied_date(state)
+    return None if latest is None else latest - pd.Timedelta(days=overlap_days)
+
+
+if __name__ == "__main__":
+    import time
+
+    # Benchmark: a full season vs adding one more matchday
+    rng = np.random.default_rng(0)
+    n_players, n_matchdays = 600, 38
+    matchdays = pd.date_range("2025-08-15", periods=n_matchdays + 1, freq="7D")
+    season = pd.DataFrame({
+        "player_name": np.repeat([f"player_{i}" for i in range(n_players)], n_matchdays),
+        "match_date": np.tile(matchdays[:-1], n_players),
+        "points": rng.integers(-2, 15, n_players * n_matchdays),
+        "minutes_played": rng.integers(0, 91, n_players * n_matchdays),
+    })
+    next_matchday = season[season["match_date"] == matchdays[-2]].assign(match_date=matchdays[-1])
+
+    state = new_form_state()
+    start = time.perf_counter()
+    update_form_state(state, season)
+    print(f"Full season ({len(season)} rows): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    applied = update_form_state(state, pd.concat([season, next_matchday]))
+    print(f"One more matchday ({applied} new rows): {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(form_metrics(state).head())
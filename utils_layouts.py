@@ -1,4 +1,5 @@
 import streamlit as st
+import pandas as pd
 
 def filter_layouts(unique_season, unique_position, unique_teams, unique_players):
     cols = st.columns(4)
@@ -23,4 +24,24 @@ def filter_layouts(unique_season, unique_position, unique_teams, unique_players)
         options=unique_players,
     )
 
-    return season, position, team, highlight_players
\ No newline at end of file
+    return season, position, team, highlight_players
+
+
+def time_travel_layout(available_dates):
+    """
+    Returns the selected past date, or None when time travel is off.
+    """
+    if len(available_dates) == 0:
+        return None
+
+    cols = st.columns([1, 4])
+    enabled = cols[0].toggle("Viaje en el tiempo", value=False)
+    if not enabled:
+        return None
+
+    options = [pd.Timestamp(d).date() for d in available_dates]
+    return cols[1].select_slider(
+        "Estadisticas a fecha de",
+        options=options,
+        value=options[-1],
+    )
@@ -0,0 +1,90 @@
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, Iterable, Optional
+
+
+MOVER_WINDOWS = ["1d", "7d", "30d"]
+
+
+def build_latest_changes(
+    market_value: pd.DataFrame,
+    player_stats: pd.DataFrame,
+    player_col: str = "player_name",
+    date_col: str = "date",
+) -> Dict[str, Any]:
+    """
+    One row per player with the value_change_* columns of its latest market value row,
+    stored as a dense (players x change columns) matrix plus position/team arrays.
+    Built once per data version; top_movers only reads it.
+    """
+    change_cols = [f"value_change_{w}" for w in MOVER_WINDOWS] + [f"value_change_{w}_pct" for w in MOVER_WINDOWS]
+    if market_value.empty:
+        latest = pd.DataFrame(columns=[player_col, "market_value_eur"] + change_cols)
+    else:
+        latest = (
+            market_value.sort_values([player_col, date_col])
+            .drop_duplicates(subset=[player_col], keep="last")
+        )
+
+    segments = player_stats[[player_col, "position", "team"]].drop_duplicates(subset=[player_col])
+    latest = latest.merge(segments, on=player_col, how="left")
+
+    return {
+        "columns": change_cols,
+        "matrix": latest[change_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64"),
+        "names": latest[player_col].to_numpy(),
+        "positions": latest["position"].to_numpy(),
+        "teams": latest["team"].to_numpy(),
+        "values": pd.to_numeric(latest["market_value_eur"], errors="coerce").to_numpy(dtype="float64"),
+    }
+
+
+def top_movers(
+    latest: Dict[str, Any],
+    window: str = "7d",
+    k: int = 10,
+    pct: bool = False,
+    positions: Optional[Iterable[str]] = None,
+    teams: Optional[Iterable[str]] = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Top-k gainers and losers for one window with np.argpartition (no full sort).
+
+    Args:
+        latest: output of build_latest_changes.
+        window: one of MOVER_WINDOWS.
+        pct: rank by % change instead of € change.
+        positions, teams: optional segment filters (empty = all).
+
+    Returns:
+        (gainers, losers), each sorted by the size of the move.
+    """
+    column = f"value_change_{window}_pct" if pct else f"value_change_{window}"
+    changes = latest["matrix"][:, latest["columns"].index(column)]
+
+    mask = ~np.isnan(changes)
+    if positions:
+        mask &= np.isin(latest["positions"], list(positions))
+    if teams:
+        mask &= np.isin(latest["teams"], list(teams))
+
+    columns = ["player_name", "position", "team", "market_value_eur", column]
+
+    def _select(pool: np.ndarray, order_values: np.ndarray) -> pd.DataFrame:
+        n = min(int(k), pool.size)
+        if n == 0:
+            return pd.DataFrame(columns=columns)
+        top = np.argpartition(order_values, n - 1)[:n]
+        top = top[np.argsort(order_values[top], kind="stable")]
+        rows = pool[top]
+        return pd.DataFrame({
+            "player_name": latest["names"][rows],
+            "position": latest["positions"][rows],
+            "team": latest["teams"][rows],
+            "market_value_eur": latest["values"][rows],
+            column: np.round(changes[rows], 2),
+        })
+
+    gainers = np.flatnonzero(mask & (changes > 0))
+    losers = np.flatnonzero(mask & (changes < 0))
+    return _select(gainers, -changes[gainers]), _select(losers, changes[losers])
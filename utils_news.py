@@ -0,0 +1,208 @@
+from supabase_client.connection import get_supabase_client
+from supabase_client.utils import (
+    check_if_table_exists
+)
+import streamlit as st
+import logging
+import pandas as pd
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+news_table_name = "article_for_streamlit"
+
+logger = logging.getLogger(__name__)
+
+_supabase = None
+_supabase_lock = threading.Lock()
+
+
+def get_supabase():
+    # Created on the first query, not at import (see utils.get_supabase)
+    global _supabase
+    with _supabase_lock:
+        if _supabase is None:
+            client = get_supabase_client()
+            if not check_if_table_exists(client, news_table_name):
+                st.warning(f"⚠️ Table '{news_table_name}' does not exist.")
+                # st.warning is dropped outside a session (e.g. the warm-up thread)
+                logger.warning("Table '%s' does not exist", news_table_name)
+            _supabase = client
+    return _supabase
+
+NEWS_CACHE_TTL = 30 * 60  # seconds
+NEWS_COLUMNS = "team,tag,markdown_document,created_at"
+
+# Page section -> raw `tag` values stored in the table
+NEWS_SECTIONS = {
+    "lesiones_sanciones": ['["lesiones_sanciones"]'],
+    "previa_siguiente_partido": ['["previa_siguiente_partido"]'],
+    "cronica_partido": ['["cronica_partido"]'],
+    "fichajes": ['["fichajes"]', '["renovaciones"]'],
+}
+
+
+def fetch_latest_article(team: str, tags: list[str]) -> Optional[dict]:
+    """
+    Latest article of a team for any of the given tags, filtered and limited server-side.
+    """
+    res = (
+        get_supabase().table(news_table_name)
+        .select(NEWS_COLUMNS)
+        .eq("team", team)
+        .in_("tag", tags)
+        .order("created_at", desc=True)
+        .limit(1)
+        .execute()
+    )
+    data = getattr(res, "data", None) or []
+    return data[0] if data else None
+
+
+def count_team_articles(team: str) -> int:
+    res = get_supabase().table(news_table_name).select("team", count="exact").eq("team", team).limit(1).execute()
+    return getattr(res, "count", None) or 0
+
+
+@st.cache_data(ttl=NEWS_CACHE_TTL)
+def load_team_news(team: str) -> Dict[Tuple[str, str], Optional[dict]]:
+    """
+    Latest article per section for one team, fetched on demand and cached per team.
+
+    Returns:
+        Dict keyed by (team, section) -> article row (or None when there is none).
+    """
+    return {(team, section): fetch_latest_article(team, tags) for section, tags in NEWS_SECTIONS.items()}
+
+
+@st.cache_data(ttl=NEWS_CACHE_TTL)
+def load_team_news_count(team: str) -> int:
+    return count_team_articles(team)
+
+
+# --- Player mentions: inverted index over article bodies ---
+
+NEWS_INDEX_TTL = 10 * 60  # seconds between incremental refreshes
+NEWS_INDEX_COLUMNS = "id,team,tag,markdown_document,created_at"
+
+
+def normalize_tokens(text: Optional[str]) -> list[str]:
+    """
+    Lowercase, accent-free alphanumeric tokens ("Mbappé" -> ["mbappe"]).
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def new_news_index() -> Dict[str, Any]:
+    return {
+        "articles": {},           # article id -> {team, tag, created_at}
+        "postings": {},           # token -> {article id -> [token positions]}
+        "last_created_at": None,  # newest created_at seen, for incremental fetches
+        "lock": threading.Lock(),
+    }
+
+
+def add_articles_to_index(index: Dict[str, Any], articles: Iterable[dict]) -> int:
+    """
+    Tokenize only the articles not indexed yet. Returns how many were added.
+    """
+    added = 0
+    with index["lock"]:
+        for article in articles:
+            article_id = article.get("id")
+            if article_id is None or article_id in index["articles"]:
+                continue
+
+            created_at = pd.to_datetime(article.get("created_at"), utc=True, errors="coerce")
+            index["articles"][article_id] = {
+                "team": article.get("team"),
+                "tag": article.get("tag"),
+                "created_at": created_at,
+            }
+            for position, token in enumerate(normalize_tokens(article.get("markdown_document"))):
+                index["postings"].setdefault(token, {}).setdefault(article_id, []).append(position)
+
+            if pd.notna(created_at) and (index["last_created_at"] is None or created_at > index["last_created_at"]):
+                index["last_created_at"] = created_at
+            added += 1
+    return added
+
+
+def find_player_articles(index: Dict[str, Any], player_name: str) -> list:
+    """
+    Ids of the articles where the player's full name appears as consecutive tokens.
+    """
+    tokens = normalize_tokens(player_name)
+    if not tokens:
+        return []
+
+    # Copied under the lock: add_articles_to_index may be growing these dicts and lists
+    with index["lock"]:
+        postings = [
+            {article_id: list(positions) for article_id, positions in index["postings"].get(t, {}).items()}
+            for t in tokens
+        ]
+    candidates = set(postings[0]).intersection(*postings[1:])
+    if len(tokens) == 1:
+        return sorted(candidates)
+
+    matches = []
+    for article_id in candidates:
+        following = [set(p[article_id]) for p in postings[1:]]
+        if any(all(start + i + 1 in pos for i, pos in enumerate(following)) for start in postings[0][article_id]):
+            matches.append(article_id)
+    return sorted(matches)
+
+
+def fetch_articles_since(created_after=None, page_size: int = 1000) -> list[dict]:
+    rows: list[dict] = []
+    start = 0
+    while True:
+        query = get_supabase().table(news_table_name).select(NEWS_INDEX_COLUMNS)
+        if created_after is not None:
+            query = query.gt("created_at", created_after.isoformat())
+        res = query.order("created_at").range(start, start + page_size - 1).execute()
+        data = getattr(res, "data", None) or []
+        if not data:
+            break
+        rows.extend(data)
+        start += page_size
+    return rows
+
+
+@st.cache_resource
+def get_news_player_index() -> Dict[str, Any]:
+    # Shared across sessions; grown by refresh_news_player_index, never rebuilt
+    return new_news_index()
+
+
+def refresh_news_player_index() -> Dict[str, Any]:
+    index = get_news_player_index()
+    add_articles_to_index(index, fetch_articles_since(index["last_created_at"]))
+    return index
+
+
+@st.cache_data(ttl=NEWS_INDEX_TTL)
+def load_player_news_flags(player_names: tuple, section: str = "lesiones_sanciones", days: int = 7) -> Dict[str, str]:
+    """
+    Hover label for every player mentioned in a recent article of `section`,
+    e.g. {"Mbappé": "lesiones_sanciones: Real Madrid (2025-10-17)"}.
+    """
+    index = refresh_news_player_index()
+    tags = set(NEWS_SECTIONS.get(section, []))
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)
+
+    flags = {}
+    for player in player_names:
+        recent = [
+            index["articles"][a] for a in find_player_articles(index, player)
+            if index["articles"][a]["tag"] in tags and index["articles"][a]["created_at"] >= cutoff
+        ]
+        if recent:
+            latest = max(recent, key=lambda a: a["created_at"])
+            flags[player] = f"{section}: {latest['team']} ({latest['created_at']:%Y-%m-%d})"
+    return flags
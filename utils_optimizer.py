@@ -0,0 +1,195 @@
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Iterable, Optional
+
+
+FORMATIONS = {
+    "3-4-3": {"1 - Portero": 1, "2 - Defensa": 3, "3 - Centrocampista": 4, "4 - Delantero": 3},
+    "3-5-2": {"1 - Portero": 1, "2 - Defensa": 3, "3 - Centrocampista": 5, "4 - Delantero": 2},
+    "4-3-3": {"1 - Portero": 1, "2 - Defensa": 4, "3 - Centrocampista": 3, "4 - Delantero": 3},
+    "4-4-2": {"1 - Portero": 1, "2 - Defensa": 4, "3 - Centrocampista": 4, "4 - Delantero": 2},
+    "4-5-1": {"1 - Portero": 1, "2 - Defensa": 4, "3 - Centrocampista": 5, "4 - Delantero": 1},
+    "5-3-2": {"1 - Portero": 1, "2 - Defensa": 5, "3 - Centrocampista": 3, "4 - Delantero": 2},
+    "5-4-1": {"1 - Portero": 1, "2 - Defensa": 5, "3 - Centrocampista": 4, "4 - Delantero": 1},
+}
+
+MAX_BUDGET_UNITS = 2_000
+
+
+def _prune_dominated(costs: np.ndarray, points: np.ndarray, need: int) -> np.ndarray:
+    """
+    Indices of players worth keeping: a player is dropped when at least `need`
+    others are no more expensive and score at least as much (ties broken by index),
+    because any lineup using that player can swap in one of them.
+    """
+    idx = np.arange(costs.size)
+    better = (
+        (costs[None, :] <= costs[:, None])
+        & (points[None, :] >= points[:, None])
+        & ((costs[None, :] < costs[:, None]) | (points[None, :] > points[:, None]) | (idx[None, :] < idx[:, None]))
+    )
+    return np.flatnonzero(better.sum(axis=1) < need)
+
+
+def _position_knapsack(costs: np.ndarray, points: np.ndarray, need: int, n_units: int):
+    """
+    Exact-count 0/1 knapsack for one position, vectorized over (count, budget).
+
+    Returns:
+        best: best[b] = max points picking exactly `need` players with cost <= b (-inf if impossible).
+        take: (players, need+1, n_units+1) decision table used for backtracking.
+    """
+    dp = np.full((need + 1, n_units + 1), -np.inf)
+    dp[0, :] = 0.0
+    take = np.zeros((costs.size, need + 1, n_units + 1), dtype=bool)
+
+    for i, (w, p) in enumerate(zip(costs, points)):
+        if w > n_units:
+            continue
+        candidate = dp[:-1, : n_units + 1 - w] + p
+        current = dp[1:, w:]
+        improved = candidate > current
+        take[i, 1:, w:] = improved
+        dp[1:, w:] = np.where(improved, candidate, current)
+
+    return dp[need], take
+
+
+def _backtrack_position(take: np.ndarray, costs: np.ndarray, need: int, budget: int) -> list[int]:
+    chosen = []
+    c, b = need, budget
+    for i in range(costs.size - 1, -1, -1):
+        if c == 0:
+            break
+        if take[i, c, b]:
+            chosen.append(i)
+            c -= 1
+            b -= costs[i]
+    return chosen
+
+
+def _max_plus(f: np.ndarray, g: np.ndarray):
+    """
+    h[b] = max_a f[a] + g[b - a], with the split `a` kept for backtracking.
+    Built as one (B+1) x (B+1) sliding-window matrix instead of a python loop.
+    """
+    n = f.size
+    padded = np.concatenate([np.full(n - 1, -np.inf), g])
+    windows = sliding_window_view(padded, n)[:, ::-1]   # windows[b, a] = g[b - a]
+    totals = f[None, :] + windows
+    split = np.argmax(totals, axis=1)
+    return totals[np.arange(n), split], split
+
+
+def optimize_squad(
+    player_stats: pd.DataFrame,
+    budget: float,
+    formation: Dict[str, int],
+    *,
+    points_col: str = "points",
+    value_col: str = "value",
+    position_col: str = "position",
+    player_name_col: str = "player_name",
+    owned_players: Optional[Iterable[str]] = None,
+    unit: int = 100_000,
+) -> pd.DataFrame:
+    """
+    Points-maximizing lineup under a budget and a formation.
+
+    Args:
+        player_stats: one row per player (load_player_stats).
+        budget: money available (€).
+        formation: position -> number of players (see FORMATIONS).
+        points_col: metric to maximize.
+        owned_players: players already in the squad (load_current_team_players 'name').
+            They cost nothing, so the result is the best set of transfers for the budget.
+        unit: cost resolution (€). Costs are rounded up so the budget is never exceeded;
+            it is widened automatically to keep at most MAX_BUDGET_UNITS budget steps.
+
+    Returns:
+        Selected players (player_name, position, value, points_col, owned), or an empty
+        DataFrame if no lineup fits the budget.
+    """
+    columns = [player_name_col, position_col, value_col, points_col, "owned"]
+    owned = set(owned_players or [])
+
+    unit = max(int(unit), int(np.ceil(max(budget, 0) / MAX_BUDGET_UNITS)))
+    n_units = int(max(budget, 0) // unit)
+
+    pool = player_stats.dropna(subset=[value_col, position_col]).assign(
+        owned=lambda d: d[player_name_col].isin(owned),
+    )
+
+    best_by_position, tables = [], []
+    for position, need in formation.items():
+        group = pool[pool[position_col] == position]
+        if need <= 0:
+            continue
+        if len(group) < need:
+            return pd.DataFrame(columns=columns)
+
+        costs = np.where(group["owned"], 0, np.ceil(group[value_col].to_numpy(dtype="float64") / unit)).astype(np.int64)
+        points = pd.to_numeric(group[points_col], errors="coerce").fillna(0).to_numpy(dtype="float64")
+
+        keep = _prune_dominated(costs, points, need)
+        best, take = _position_knapsack(costs[keep], points[keep], need, n_units)
+        best_by_position.append(best)
+        tables.append((group.iloc[keep], costs[keep], take, need))
+
+    if not best_by_position:
+        return pd.DataFrame(columns=columns)
+
+    # Merge positions one by one, remembering how the budget was split
+    total, splits = best_by_position[0], []
+    for best in best_by_position[1:]:
+        total, split = _max_plus(total, best)
+        splits.append(split)
+
+    if not np.isfinite(total[n_units]):
+        return pd.DataFrame(columns=columns)
+
+    # Walk the splits backwards to recover each position's budget
+    budgets, b = [], n_units
+    for split in reversed(splits):
+        a = int(split[b])
+        budgets.append(b - a)
+        b = a
+    budgets.append(b)
+    budgets.reverse()
+
+    selected = []
+    for (group, costs, take, need), position_budget in zip(tables, budgets):
+        chosen = _backtrack_position(take, costs, need, position_budget)
+        selected.append(group.iloc[sorted(chosen)])
+
+    return (
+        pd.concat(selected)[columns]
+        .sort_values([position_col, points_col], ascending=[True, False])
+        .reset_index(drop=True)
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    # Benchmark on synthetic pools around the size of the real one (~600 players)
+    rng = np.random.default_rng(0)
+    positions = list(FORMATIONS["4-4-2"].keys())
+
+    for n_players in (300, 600, 1_200):
+        synthetic = pd.DataFrame({
+            "player_name": [f"player_{i}" for i in range(n_players)],
+            "position": rng.choice(positions, n_players, p=[0.1, 0.35, 0.35, 0.2]),
+            "value": rng.integers(2, 400, n_players) * 100_000,
+        })
+        synthetic["points"] = np.round(synthetic["value"] / 100_000 * rng.uniform(0.3, 1.5, n_players))
+
+        for budget in (50_000_000, 150_000_000):
+            start = time.perf_counter()
+            lineup = optimize_squad(synthetic, budget=budget, formation=FORMATIONS["4-4-2"])
+            elapsed = (time.perf_counter() - start) * 1000
+            print(
+                f"{n_players:>5} players | budget {budget / 1e6:>5.0f}M | {elapsed:7.1f} ms | "
+                f"points {lineup['points'].sum():.0f} | cost {lineup['value'].sum() / 1e6:.1f}M"
+            )
@@ -0,0 +1,128 @@
+import os
+import logging
+import pandas as pd
+import numpy as np
+from types import ModuleType
+from typing import List, Optional
+
+from utils_timeline import asof_join_timeline
+
+
+logger = logging.getLogger(__name__)
+
+# Engine for the load -> enrich -> join stages of the loaders: "pandas" (this module)
+# or "polars" (utils_polars, lazy and multi-threaded, optional dependency)
+PIPELINE_ENGINE = os.environ.get("BIWENGER_ENGINE", "pandas").lower()
+
+POSITION_LABELS = {
+    "Defender": "2 - Defensa",
+    "Forward": "4 - Delantero",
+    "Goalkeeper": "1 - Portero",
+    "Midfielder": "3 - Centrocampista",
+}
+TIMELINE_STATS_DROP = ['season', 'position', 'team', 'status_detail', 'min_value', 'max_value', 'value']
+TIMELINE_STATS_RENAME = {'points': 'total_points', 'average': 'points_per_game'}
+TIMELINE_MATCHES_DROP = ['season_label', 'best_xi', 'events', 'team', 'as_of_date']
+
+
+def get_pipeline_engine(engine: Optional[str] = None) -> ModuleType:
+    """
+    Module implementing the pipeline stages for `engine` (default: PIPELINE_ENGINE).
+    Both expose the same functions and return pandas frames.
+    """
+    engine = (engine or PIPELINE_ENGINE).lower()
+    if engine == "polars":
+        try:
+            import utils_polars
+            return utils_polars
+        except ImportError:
+            logger.warning("BIWENGER_ENGINE=polars but polars is not installed, using pandas")
+    import utils_pipeline
+    return utils_pipeline
+
+
+def frame_from_rows(rows: List[dict], drop_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    df = pd.DataFrame(rows)
+    if drop_columns:
+        df = df.drop(columns=[c for c in drop_columns if c in df.columns], errors="ignore")
+    return df
+
+
+def enrich_player_stats(df: pd.DataFrame, keep_latest: bool = True) -> pd.DataFrame:
+    df['as_of_date'] = pd.to_datetime(df['as_of_date'])
+
+    if keep_latest:
+        # Sort so newest per player is first, then drop duplicates
+        df = df.sort_values(["player_name", "as_of_date"], ascending=[True, False])
+        df_latest = df.drop_duplicates(subset=["player_name"], keep="first").reset_index(drop=True)
+    else:
+        # Sorted by (player, date) once here so as-of joins can skip re-sorting
+        df_latest = df.sort_values(["player_name", "as_of_date"]).reset_index(drop=True)
+
+    # Your existing enrichments
+    return (
+        df_latest.assign(
+            points_per_value=lambda d: np.round(
+                np.maximum(0, d["points"] / d["value"].replace(0, np.nan)) * 100_000, 2
+            ),
+            ratio_purchase_sales=lambda d: np.round(
+                np.maximum(0, d["market_purchases_pct"] / d["market_sales_pct"]).replace(0, np.nan), 2
+            ),
+            position=lambda d: d["position"].map(POSITION_LABELS),
+        )
+    )
+
+
+def enrich_player_matches(df: pd.DataFrame) -> pd.DataFrame:
+    df['match_date'] = pd.to_datetime(df['match_date'])
+
+    # Sorted by (player, date) once here so as-of joins can skip re-sorting
+    return df.sort_values(["player_name", "match_date"]).reset_index(drop=True)
+
+
+def enrich_market_value(df: pd.DataFrame) -> pd.DataFrame:
+    # Convert date and compute your time-series features
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values(["player_name", "date"]).reset_index(drop=True)
+
+    def add_features(g: pd.DataFrame) -> pd.DataFrame:
+        return g.assign(
+            value_change_1d=g["market_value_eur"].diff(),
+            value_change_1d_pct=g["market_value_eur"].pct_change() * 100,
+            value_change_7d=g["market_value_eur"].diff(periods=7),
+            value_change_7d_pct=g["market_value_eur"].pct_change(periods=7) * 100,
+            value_change_30d=g["market_value_eur"].diff(periods=30),
+            value_change_30d_pct=g["market_value_eur"].pct_change(periods=30) * 100,
+            value_avg_7d=g["market_value_eur"].rolling(window=7, min_periods=1).mean(),
+            value_avg_14d=g["market_value_eur"].rolling(window=14, min_periods=1).mean(),
+            value_avg_30d=g["market_value_eur"].rolling(window=30, min_periods=1).mean(),
+        )
+
+    if df.empty:
+        # groupby().apply on no rows would return the input columns only
+        df = add_features(df.astype({"market_value_eur": "float64"}))
+    else:
+        df = df.groupby("player_name", group_keys=False).apply(add_features).reset_index(drop=True)
+
+    df['date'] = pd.to_datetime(df['date'])
+
+    return df.sort_values(["player_name", "date"], ascending=[True, False])
+
+
+def join_timeline(values: pd.DataFrame, matches: pd.DataFrame, stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Market value rows with the latest match and stats snapshot at or before each date
+    (inputs as returned by the loaders above).
+    """
+    stats = stats.drop(columns=TIMELINE_STATS_DROP).rename(columns=TIMELINE_STATS_RENAME)
+    matches = matches.drop(columns=TIMELINE_MATCHES_DROP)
+
+    return asof_join_timeline(
+        values,
+        matches,
+        stats,
+        player_col="player_name",
+        value_date_col="date",
+        match_date_col="match_date",
+        stats_date_col="as_of_date",
+    )
@@ -1,7 +1,13 @@
-import plotly.graph_objects as go
-import plotly.express as px
+from __future__ import annotations
+
 import pandas as pd
 import numpy as np
+from typing import TYPE_CHECKING
+
+# Plotly is imported inside the render functions: it is the slowest import of the pages
+# and the constants below are needed before any chart is drawn
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
 POSITION_COLOURS = {
@@ -18,6 +24,10 @@ POSITION_ORDER = [
     "4 - Delantero"
 ]
 
+STATS_CHART_METRICS = ['points', 'value', 'matches_played', 'average', 'points_per_value']
+FORM_CHART_METRICS = ['form_points', 'form_avg', 'form_std', 'form_minutes_trend']
+MARKET_CHART_METRICS = ['market_purchases_pct', 'market_sales_pct', 'market_usage_pct', 'ratio_purchase_sales', 'value']
+
 def render_player_scatter(
     df: pd.DataFrame,
     *,
@@ -30,6 +40,9 @@ def render_player_scatter(
     position_colors: dict | None = None,
     show_tertiles: bool = True,
     height: int = 600,
+    simulated_df: pd.DataFrame | None = None,
+    tertiles: dict[str, tuple[float, float] | None] | None = None,
+    hover_extra: list[str] | None = None,
 ) -> go.Figure:
     """
     Build a reusable scatter plot for player stats.
@@ -44,11 +57,17 @@ def render_player_scatter(
         position_colors: mapping for position -> color string.
         show_tertiles: draw 33% and 67% quantile guide lines for both axes.
         height: chart height.
+        simulated_df: optional simulated rows (same columns as df) drawn as an extra
+            highlight layer, so callers don't need to concat them into df.
+        tertiles: optional precomputed (q33, q67) per metric (see utils_stats_cube);
+            metrics missing here fall back to computing the quantiles on df.
+        hover_extra: extra columns shown in the hover (e.g. percentile ranks).
 
     Returns:
         Plotly Figure.
     """
-    import numpy as np
+    import plotly.graph_objects as go
+    import plotly.express as px
 
     if df.empty:
         # Return an empty figure with a friendly annotation
@@ -92,15 +111,16 @@ def render_player_scatter(
             x_metric: True,
             y_metric: True,
             position_col: False,
+            **{c: True for c in (hover_extra or []) if c in df_plot.columns and c not in (x_metric, y_metric)},
         },
         height=height,
     )
 
     # Helper for highlight layer
-    def _highlight_layer(players: list[str], marker_color: str, line_color: str):
+    def _highlight_layer(players: list[str], marker_color: str, line_color: str, source: pd.DataFrame = df_plot):
         if not players:
             return
-        sub = df_plot[df_plot[player_name_col].isin(players)]
+        sub = source[source[player_name_col].isin(players)]
         if sub.empty:
             return
         fig.add_trace(
@@ -124,11 +144,19 @@ def render_player_scatter(
     _highlight_layer(current_team_players or [], "rgb(125, 60, 152)", "rgb(187, 143, 206)")
     _highlight_layer(extra_highlight_players or [], "black", "grey")
 
+    if simulated_df is not None and not simulated_df.empty:
+        sim_plot = simulated_df.copy()
+        sim_plot[x_metric] = np.round(pd.to_numeric(sim_plot[x_metric], errors="coerce"), 2)
+        sim_plot[y_metric] = np.round(pd.to_numeric(sim_plot[y_metric], errors="coerce"), 2)
+        sim_plot = sim_plot.dropna(subset=[x_metric, y_metric])
+        _highlight_layer(sim_plot[player_name_col].unique().tolist(), "black", "grey", source=sim_plot)
+
     # Tertile guides
     if show_tertiles and not df_plot.empty:
         try:
-            x_tertiles = [df_plot[x_metric].quantile(q) for q in (0.33, 0.67)]
-            y_tertiles = [df_plot[y_metric].quantile(q) for q in (0.33, 0.67)]
+            tertiles = tertiles or {}
+            x_tertiles = tertiles.get(x_metric) or [df_plot[x_metric].quantile(q) for q in (0.33, 0.67)]
+            y_tertiles = tertiles.get(y_metric) or [df_plot[y_metric].quantile(q) for q in (0.33, 0.67)]
             guide_color = "rgb(248, 196, 113)"
 
             for x_val in x_tertiles:
@@ -166,6 +194,8 @@ def render_value_timeseries(
     """
     Minimal time-series: one line per player for 'value' over time.
     """
+    import plotly.graph_objects as go
+    import plotly.express as px
     # Basic validation
     missing = [c for c in [date_col, value_col, player_col] if c not in df.columns]
     if missing:
@@ -236,6 +266,7 @@ def render_value_timeseries(
             date_col="match_date",
             points_col="points",
             value_col=value_col,
+            x_col=date_col,
             line_dash="dash",
             line_width=1,
             label_size=10,
@@ -251,6 +282,7 @@ def add_match_overlays_traces(
     date_col: str = "match_date",
     points_col: str = "points",
     value_col: str = "value",     # main y feature used in your timeseries
+    x_col: str | None = None,     # x date column; matches before its first date are skipped
     line_dash: str = "dash",
     line_width: int = 1,
     label_size: int = 10,
@@ -261,6 +293,8 @@ def add_match_overlays_traces(
     These traces share legendgroup with the player's main line, so legend clicks
     toggle them together (requires fig.update_layout(legend_groupclick='togglegroup')).
     """
+    import plotly.graph_objects as go
+
     if date_col not in df.columns:
         return
 
@@ -268,6 +302,9 @@ def add_match_overlays_traces(
     d[date_col]   = pd.to_datetime(d[date_col], errors="coerce")
     d[value_col]  = pd.to_numeric(d[value_col], errors="coerce")
     d[points_col] = pd.to_numeric(d[points_col], errors="coerce")
+    if x_col and x_col in d.columns:
+        # As-of joined rows carry the last match even when it falls before the window
+        d.loc[d[date_col] < d[x_col].min(), [date_col, points_col]] = np.nan
     # d = d.dropna(subset=[date_col, value_col])
 
     if d.empty:
@@ -296,7 +333,12 @@ def add_match_overlays_traces(
             color_by_player[str(name)] = col
 
     # Label stacking index per date across ALL players
-    lab = d.dropna(subset=[points_col])[[player_col, date_col, points_col]].copy()
+    # One label per match (as-of joined timelines repeat the last match on later days)
+    lab = (
+        d.dropna(subset=[points_col])[[player_col, date_col, points_col]]
+        .drop_duplicates(subset=[player_col, date_col])
+        .copy()
+    )
     if not lab.empty:
         lab["stack_idx"] = (
             lab.groupby(date_col)[points_col]
@@ -364,4 +406,62 @@ def add_match_overlays_traces(
     fig.update_layout(legend=dict(groupclick="togglegroup"))
 
 
+def render_breakeven_curve(
+    df: pd.DataFrame,
+    *,
+    price_col: str = "value",
+    percentile_col: str = "position_percentile",
+    player_col: str = "player_name",
+    break_even_col: str = "break_even_price",
+    height: int = 420,
+) -> go.Figure:
+    """
+    Percentile of points_per_value inside the position group for every simulated price.
+    The dotted line at 50 is the position median: where each curve crosses it is the
+    break-even price for that player.
+    """
+    import plotly.graph_objects as go
+    import plotly.express as px
+    missing = [c for c in [price_col, percentile_col, player_col] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns in DataFrame: {missing}")
+
+    if df.empty:
+        fig = go.Figure()
+        fig.add_annotation(
+            text="No simulation data available",
+            x=0.5, y=0.5, xref="paper", yref="paper", showarrow=False
+        )
+        fig.update_layout(height=height, margin=dict(l=20, r=20, t=20, b=20))
+        return fig
+
+    d = df.sort_values([player_col, price_col])
+
+    fig = px.line(
+        d,
+        x=price_col,
+        y=percentile_col,
+        color=player_col,
+        height=height,
+        color_discrete_sequence=px.colors.qualitative.G10,
+        hover_data={"points_per_value": True} if "points_per_value" in d.columns else None,
+    )
+
+    fig.add_hline(y=50, line_dash="dot", line_color="grey")
 
+    if break_even_col in d.columns:
+        color_by_player = {tr.name: tr.line.color for tr in fig.data}
+        break_even = d.dropna(subset=[break_even_col]).drop_duplicates(subset=[player_col])
+        lo, hi = d[price_col].min(), d[price_col].max()
+        for player, price in zip(break_even[player_col], break_even[break_even_col]):
+            if lo <= price <= hi:
+                fig.add_vline(x=price, line_dash="dash", line_color=color_by_player.get(player, "grey"))
+
+    fig.update_layout(
+        xaxis_title="Coste simulado (€)",
+        yaxis_title="Percentil en su posición",
+        yaxis_range=[0, 100],
+        legend_title_text="Jugador",
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+    return fig
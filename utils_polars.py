@@ -0,0 +1,230 @@
+import pandas as pd
+import polars as pl
+from typing import List, Optional, Union
+
+from utils_pipeline import (
+    POSITION_LABELS,
+    TIMELINE_STATS_DROP,
+    TIMELINE_STATS_RENAME,
+    TIMELINE_MATCHES_DROP
+)
+
+
+# Same stages as utils_pipeline, as lazy Polars queries (multi-threaded, no intermediate
+# copies between steps). Everything returned to the loaders is a pandas frame.
+
+FrameLike = Union[pl.DataFrame, pl.LazyFrame, pd.DataFrame]
+
+
+def _lazy(df: FrameLike) -> pl.LazyFrame:
+    if isinstance(df, pd.DataFrame):
+        df = pl.from_pandas(df)
+    return df.lazy()
+
+
+def _to_datetime(col: str) -> pl.Expr:
+    # Supabase sends dates as ISO strings; ns to match pd.to_datetime
+    expr = pl.col(col)
+    return (
+        pl.when(expr.is_null()).then(None)
+        .otherwise(expr.cast(pl.String).str.to_datetime(time_unit="ns", strict=False))
+        .alias(col)
+    )
+
+
+def _to_pandas(lf: pl.LazyFrame) -> pd.DataFrame:
+    return lf.collect().to_pandas()
+
+
+def frame_from_rows(rows: List[dict], drop_columns: Optional[List[str]] = None) -> pl.DataFrame:
+    # Nested values (e.g. match events) become list/struct columns
+    df = pl.from_dicts(rows, infer_schema_length=None, strict=False)
+    if drop_columns:
+        df = df.drop([c for c in drop_columns if c in df.columns])
+    return df
+
+
+def enrich_player_stats(df: FrameLike, keep_latest: bool = True) -> pd.DataFrame:
+    lf = _lazy(df).with_columns(_to_datetime("as_of_date"))
+
+    if keep_latest:
+        lf = (
+            lf.sort(["player_name", "as_of_date"], descending=[False, True], nulls_last=True, maintain_order=True)
+            .unique(subset=["player_name"], keep="first", maintain_order=True)
+        )
+    else:
+        lf = lf.sort(["player_name", "as_of_date"], nulls_last=True, maintain_order=True)
+
+    value, purchases, sales = (pl.col(c).cast(pl.Float64) for c in ("value", "market_purchases_pct", "market_sales_pct"))
+    ratio = (purchases / sales).clip(lower_bound=0)
+
+    return _to_pandas(lf.with_columns(
+        points_per_value=pl.when(value != 0)
+        .then((pl.col("points").cast(pl.Float64) / value).clip(lower_bound=0) * 100_000)
+        .round(2),
+        ratio_purchase_sales=pl.when(ratio != 0).then(ratio).round(2),
+        position=pl.col("position").replace_strict(POSITION_LABELS, default=None),
+    ))
+
+
+def enrich_player_matches(df: FrameLike) -> pd.DataFrame:
+    return _to_pandas(
+        _lazy(df)
+        .with_columns(_to_datetime("match_date"))
+        .sort(["player_name", "match_date"], nulls_last=True, maintain_order=True)
+    )
+
+
+def enrich_market_value(df: FrameLike) -> pd.DataFrame:
+    value = pl.col("market_value_eur").cast(pl.Float64)
+
+    def by_player(expr: pl.Expr) -> pl.Expr:
+        return expr.over("player_name")
+
+    return _to_pandas(
+        _lazy(df)
+        .with_columns(_to_datetime("date"))
+        .sort(["player_name", "date"], nulls_last=True, maintain_order=True)
+        .with_columns(
+            value_change_1d=by_player(value.diff(1)),
+            value_change_1d_pct=by_player(value.pct_change(1) * 100),
+            value_change_7d=by_player(value.diff(7)),
+            value_change_7d_pct=by_player(value.pct_change(7) * 100),
+            value_change_30d=by_player(value.diff(30)),
+            value_change_30d_pct=by_player(value.pct_change(30) * 100),
+            value_avg_7d=by_player(value.rolling_mean(7, min_samples=1)),
+            value_avg_14d=by_player(value.rolling_mean(14, min_samples=1)),
+            value_avg_30d=by_player(value.rolling_mean(30, min_samples=1)),
+        )
+        .sort(["player_name", "date"], descending=[False, True], nulls_last=True, maintain_order=True)
+    )
+
+
+def join_timeline(values: FrameLike, matches: FrameLike, stats: FrameLike) -> pd.DataFrame:
+    """
+    Market value rows with the latest match and stats snapshot at or before each date,
+    as two as-of joins by player. Row order of `values` is preserved.
+    """
+    values = _lazy(values).with_row_index("__row")
+    stats = _lazy(stats).drop(TIMELINE_STATS_DROP).rename(TIMELINE_STATS_RENAME).drop_nulls("as_of_date")
+    matches = _lazy(matches).drop(TIMELINE_MATCHES_DROP).drop_nulls("match_date")
+
+    timeline = values.sort("date")
+    for right, date_col in ((matches, "match_date"), (stats, "as_of_date")):
+        timeline = timeline.join_asof(
+            right.sort(date_col),
+            left_on="date",
+            right_on=date_col,
+            by="player_name",
+            strategy="backward",
+            suffix="_y",
+            check_sortedness=False,
+        )
+
+    return _to_pandas(timeline.sort("__row").drop("__row"))
+
+
+def run_pipeline(engine, rows: dict) -> dict:
+    """
+    Every stage of the loaders on raw Supabase rows with the given engine module.
+
+    Args:
+        rows: {"player_stats": [...], "player_matches": [...], "player_value": [...]}.
+    """
+    drop = ["id", "created_at"]
+    history = engine.enrich_player_stats(engine.frame_from_rows(rows["player_stats"], drop), keep_latest=False)
+    matches = engine.enrich_player_matches(engine.frame_from_rows(rows["player_matches"], drop))
+    values = engine.enrich_market_value(engine.frame_from_rows(rows["player_value"], drop))
+    return {
+        "stats": engine.enrich_player_stats(engine.frame_from_rows(rows["player_stats"], drop), keep_latest=True),
+        "history": history,
+        "matches": matches,
+        "values": values,
+        "timeline": engine.join_timeline(values, matches, history),
+    }
+
+
+def assert_same_frames(expected: dict, got: dict) -> None:
+    """
+    Assert two {name: frame} results of the engines are the same: columns, row order
+    and values (dtypes may differ, e.g. int with nulls vs float). Nested columns
+    (match events) are only compared by name.
+    """
+    for name in expected:
+        e, g = expected[name].reset_index(drop=True), got[name].reset_index(drop=True)
+        pd.testing.assert_index_equal(e.columns, g.columns, obj=f"{name} columns")
+        scalar = [c for c in e.columns if c != "events"]
+        pd.testing.assert_frame_equal(
+            e[scalar].astype(object).where(e[scalar].notna(), None),
+            g[scalar].astype(object).where(g[scalar].notna(), None),
+            check_dtype=False,
+            obj=name,
+        )
+
+
+def check_parity(rows: dict) -> None:
+    """
+    Assert the pandas and Polars engines give the same frames on the same raw rows.
+    """
+    from utils_pipeline import get_pipeline_engine
+
+    assert_same_frames(
+        run_pipeline(get_pipeline_engine("pandas"), rows),
+        run_pipeline(get_pipeline_engine("polars"), rows),
+    )
+
+
+def synthetic_rows(n_players: int, n_days: int, seed: int = 0) -> dict:
+    """
+    Raw rows shaped like the Supabase tables (ISO date strings, nested match events).
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    players = [f"player_{i:04d}" for i in range(n_players)]
+    dates = pd.date_range("2025-08-01", periods=n_days, freq="D").strftime("%Y-%m-%d").tolist()
+    positions = list(POSITION_LABELS)
+
+    player_value = [
+        {"id": 0, "player_name": p, "date": d, "market_value_eur": int(rng.integers(1, 300)) * 100_000}
+        for p in players for d in dates
+    ]
+    player_matches = [
+        {"id": 0, "player_name": p, "match_date": d, "points": int(rng.integers(-2, 15)),
+         "season_label": "2025/26", "best_xi": bool(rng.random() < 0.1),
+         "events": [{"type": "goal", "minute": int(rng.integers(1, 90))}] if rng.random() < 0.2 else [],
+         "team": "Team", "as_of_date": d}
+        for p in players for d in dates[::7]
+    ]
+    player_stats = [
+        {"id": 0, "player_name": p, "as_of_date": d, "season": 2026, "team": "Team",
+         "position": positions[i % 4], "status_detail": None,
+         "points": int(rng.integers(0, 200)), "average": float(rng.random() * 10),
+         "value": int(rng.integers(0, 300)) * 100_000, "min_value": 0, "max_value": 0,
+         "matches_played": int(rng.integers(0, 30)),
+         "market_purchases_pct": int(rng.integers(0, 100)), "market_sales_pct": int(rng.integers(0, 100))}
+        for i, p in enumerate(players) for d in dates[3::7]
+    ]
+    return {"player_stats": player_stats, "player_matches": player_matches, "player_value": player_value}
+
+
+if __name__ == "__main__":
+    import time
+    from utils_pipeline import get_pipeline_engine
+
+    # Parity and benchmark of the full load -> enrich -> join pipeline at several scales
+    engines = {"pandas": get_pipeline_engine("pandas"), "polars": get_pipeline_engine("polars")}
+
+    for n_players, n_days in ((50, 60), (300, 180), (600, 365), (1500, 365)):
+        rows = synthetic_rows(n_players, n_days)
+        if n_players <= 300:
+            check_parity(rows)
+        timings = {}
+        for label, engine in engines.items():
+            start = time.perf_counter()
+            run_pipeline(engine, rows)
+            timings[label] = (time.perf_counter() - start) * 1000
+        print(f"{n_players:>5} players x {n_days} days ({len(rows['player_value']):>7} value rows): "
+              f"pandas {timings['pandas']:8.1f} ms | polars {timings['polars']:8.1f} ms "
+              f"| x{timings['pandas'] / timings['polars']:.1f}")
+    print("parity ok")
@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, Iterable, Optional
+
+
+SIMILARITY_FEATURES = [
+    "points",
+    "average",
+    "matches_played",
+    "points_per_value",
+    "market_purchases_pct",
+    "market_sales_pct",
+    "market_usage_pct",
+]
+
+
+def build_similarity_index(
+    df: pd.DataFrame,
+    features: Iterable[str] = tuple(SIMILARITY_FEATURES),
+    player_name_col: str = "player_name",
+    position_col: str = "position",
+    value_col: str = "value",
+) -> Dict[str, Any]:
+    """
+    Standardize the feature columns into a dense (players x features) float matrix.
+    Build it once per data version; queries are then pure NumPy on this matrix.
+    Missing values are imputed with the feature mean (0 once standardized).
+    """
+    features = [f for f in features if f in df.columns]
+    raw = df[features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+
+    mean = np.nanmean(raw, axis=0) if len(raw) else np.zeros(len(features))
+    std = np.nanstd(raw, axis=0) if len(raw) else np.ones(len(features))
+    std = np.where((std > 0) & np.isfinite(std), std, 1.0)
+
+    matrix = np.nan_to_num((raw - mean) / std, nan=0.0)
+
+    return {
+        "features": features,
+        "matrix": np.ascontiguousarray(matrix, dtype="float32"),
+        "names": df[player_name_col].to_numpy(),
+        "positions": df[position_col].to_numpy(),
+        "values": pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype="float64"),
+    }
+
+
+def find_similar_players(
+    index: Dict[str, Any],
+    player: str,
+    k: int = 5,
+    max_price: Optional[float] = None,
+    same_position: bool = True,
+    candidates: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Top-k nearest players (euclidean distance on the standardized features) to `player`.
+
+    Args:
+        index: output of build_similarity_index.
+        player: reference player name.
+        k: number of players to return.
+        max_price: only players with value <= max_price (None = no cap).
+        same_position: restrict to the reference player's position.
+        candidates: optional names allowed by the page filters.
+
+    Returns:
+        DataFrame with player_name, position, value and distance, closest first.
+    """
+    names = index["names"]
+    hits = np.flatnonzero(names == player)
+    if hits.size == 0:
+        return pd.DataFrame(columns=["player_name", "position", "value", "distance"])
+    ref = hits[0]
+
+    mask = names != player
+    if same_position:
+        mask &= index["positions"] == index["positions"][ref]
+    if max_price is not None:
+        mask &= index["values"] <= max_price
+    if candidates is not None:
+        mask &= np.isin(names, list(candidates))
+
+    pool = np.flatnonzero(mask)
+    if pool.size == 0:
+        return pd.DataFrame(columns=["player_name", "position", "value", "distance"])
+
+    diff = index["matrix"][pool] - index["matrix"][ref]
+    dist = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+    k = min(int(k), pool.size)
+    top = np.argpartition(dist, k - 1)[:k]
+    top = top[np.argsort(dist[top], kind="stable")]
+
+    return pd.DataFrame({
+        "player_name": names[pool[top]],
+        "position": index["positions"][pool[top]],
+        "value": index["values"][pool[top]],
+        "distance": np.round(dist[top], 3),
+    })
+
+
+if __name__ == "__main__":
+    import time
+
+    # Benchmark on a synthetic pool a few times the size of the real one
+    rng = np.random.default_rng(0)
+    n_players = 3_000
+    synthetic = pd.DataFrame({
+        "player_name": [f"player_{i}" for i in range(n_players)],
+        "position": rng.choice(["1 - Portero", "2 - Defensa", "3 - Centrocampista", "4 - Delantero"], n_players),
+        "value": rng.integers(2, 400, n_players) * 100_000,
+        **{f: rng.random(n_players) * 100 for f in SIMILARITY_FEATURES},
+    })
+
+    start = time.perf_counter()
+    synthetic_index = build_similarity_index(synthetic)
+    print(f"Index built in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    n_queries = 500
+    start = time.perf_counter()
+    for i in rng.integers(0, n_players, n_queries):
+        find_similar_players(synthetic_index, f"player_{i}", k=10, max_price=10_000_000)
+    print(f"Mean query time: {(time.perf_counter() - start) * 1000 / n_queries:.3f} ms over {n_players} players")
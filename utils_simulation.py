@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+from typing import Iterable
+
+
+def build_price_grid(min_price: int, max_price: int, steps: int = 60) -> np.ndarray:
+    """
+    Evenly spaced candidate prices between min_price and max_price (both included),
+    rounded to the nearest 10,000€ like Biwenger market values.
+    """
+    min_price = max(0, int(min_price))
+    max_price = max(min_price, int(max_price))
+    grid = np.linspace(min_price, max_price, num=max(2, int(steps)))
+    return np.unique(np.round(grid / 10_000) * 10_000).astype(np.int64)
+
+
+def points_per_value(points, value) -> np.ndarray:
+    """
+    Same definition as load_player_stats: points per 100,000€, floored at 0,
+    NaN when the value is 0.
+    """
+    points = np.asarray(points, dtype="float64")
+    value = np.asarray(value, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ppv = np.where(value > 0, np.maximum(0, points / value) * 100_000, np.nan)
+    return np.round(ppv, 2)
+
+
+def simulate_cost_sweep(
+    df: pd.DataFrame,
+    players: Iterable[str],
+    prices: Iterable[float],
+    *,
+    player_name_col: str = "player_name",
+    position_col: str = "position",
+    points_col: str = "points",
+    value_col: str = "value",
+) -> pd.DataFrame:
+    """
+    Evaluate every candidate price for every selected player in a single vectorized pass.
+
+    Args:
+        df: player stats as returned by load_player_stats (already filtered by the page).
+        players: names of the players to simulate.
+        prices: candidate costs (€).
+
+    Returns:
+        One row per (player row, price) with every original column, plus:
+            value: the candidate price.
+            points_per_value: recomputed for that price.
+            position_percentile: % of the rest of the position group with a
+                points_per_value <= the simulated one.
+            break_even_price: price at which the player matches the position median.
+    """
+    players = list(players or [])
+    prices = np.asarray(list(prices), dtype="float64")
+
+    base = df[df[player_name_col].isin(players)]
+    if base.empty or prices.size == 0:
+        return pd.DataFrame(columns=list(df.columns) + ["position_percentile", "break_even_price"])
+
+    n_rows, n_prices = len(base), prices.size
+
+    # Cartesian product (player row x price) without any python loop
+    sim = base.iloc[np.repeat(np.arange(n_rows), n_prices)].reset_index(drop=True)
+    sim_prices = np.tile(prices, n_rows)
+    sim_ppv = points_per_value(sim[points_col].to_numpy(dtype="float64"), sim_prices)
+
+    # Reference pool: everyone else, grouped by position, sorted once
+    pool = df[~df[player_name_col].isin(players)]
+    pool_ppv = pd.to_numeric(pool["points_per_value"], errors="coerce")
+
+    percentile = np.full(sim_ppv.shape, np.nan)
+    break_even = np.full(sim_ppv.shape, np.nan)
+    sim_positions = sim[position_col].to_numpy()
+    sim_points = sim[points_col].to_numpy(dtype="float64")
+
+    for position, group_ppv in pool_ppv.groupby(pool[position_col]):
+        ref = np.sort(group_ppv.dropna().to_numpy(dtype="float64"))
+        mask = sim_positions == position
+        if ref.size == 0 or not mask.any():
+            continue
+
+        ranks = np.searchsorted(ref, sim_ppv[mask], side="right")
+        percentile[mask] = np.where(np.isnan(sim_ppv[mask]), np.nan, ranks / ref.size * 100)
+
+        median_ppv = np.median(ref)
+        if median_ppv > 0:
+            break_even[mask] = np.maximum(0, sim_points[mask]) * 100_000 / median_ppv
+
+    return sim.assign(
+        **{value_col: sim_prices.astype(np.int64)},
+        points_per_value=sim_ppv,
+        position_percentile=np.round(percentile, 1),
+        break_even_price=np.round(break_even, -4),
+    )
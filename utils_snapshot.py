@@ -0,0 +1,193 @@
+import os
+import json
+import shutil
+import inspect
+import functools
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Union
+
+import pandas as pd
+import streamlit as st
+
+
+SNAPSHOT_DIR = os.environ.get(
+    "BIWENGER_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"),
+)
+CURRENT_POINTER = "CURRENT"
+SNAPSHOT_VERSIONS_TO_KEEP = 3
+
+
+def snapshots_enabled() -> bool:
+    # BIWENGER_SNAPSHOT=off forces the loaders back to Supabase (used when building)
+    return os.environ.get("BIWENGER_SNAPSHOT", "on").lower() != "off"
+
+
+def current_snapshot_version(snapshot_dir: str = SNAPSHOT_DIR) -> Optional[str]:
+    pointer = os.path.join(snapshot_dir, CURRENT_POINTER)
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer) as f:
+        version = f.read().strip()
+    return version if version and os.path.isdir(os.path.join(snapshot_dir, version)) else None
+
+
+def _to_arrow(df: pd.DataFrame):
+    import pyarrow as pa
+
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed python objects (e.g. match events) are stored as JSON text
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) else json.dumps(v, default=str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_snapshot(tables: Dict[str, pd.DataFrame], snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    """
+    Write every table as an uncompressed Arrow IPC (Feather v2) file under a new
+    version directory, then switch the CURRENT pointer atomically. Readers only
+    ever see complete versions.
+
+    Returns:
+        The new version name.
+    """
+    import pyarrow.feather as feather
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    staging = os.path.join(snapshot_dir, f".{version}.tmp")
+    os.makedirs(staging, exist_ok=True)
+
+    for name, df in tables.items():
+        # Uncompressed so readers can memory-map the buffers as they are on disk
+        feather.write_feather(_to_arrow(df), os.path.join(staging, f"{name}.arrow"), compression="uncompressed")
+
+    os.replace(staging, os.path.join(snapshot_dir, version))
+
+    pointer_tmp = os.path.join(snapshot_dir, f".{CURRENT_POINTER}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(snapshot_dir, CURRENT_POINTER))
+
+    prune_snapshots(snapshot_dir)
+    return version
+
+
+def prune_snapshots(snapshot_dir: str = SNAPSHOT_DIR, keep: int = SNAPSHOT_VERSIONS_TO_KEEP) -> None:
+    # Processes still mapping an old version keep their pages until they reload
+    versions = sorted(d for d in os.listdir(snapshot_dir)
+                      if not d.startswith(".") and os.path.isdir(os.path.join(snapshot_dir, d)))
+    for version in versions[:-keep]:
+        shutil.rmtree(os.path.join(snapshot_dir, version), ignore_errors=True)
+
+
+@st.cache_resource(max_entries=32)
+def _read_snapshot_table(name: str, version: str, snapshot_dir: str = SNAPSHOT_DIR) -> Optional[pd.DataFrame]:
+    import pyarrow as pa
+
+    path = os.path.join(snapshot_dir, version, f"{name}.arrow")
+    if not os.path.exists(path):
+        return None
+
+    # Read-only memory map: the buffers live in the OS page cache shared by every
+    # process. Numeric columns without nulls stay zero-copy in pandas (split_blocks
+    # avoids consolidating them); strings and nullable columns are materialized.
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def load_snapshot_table(name: str) -> Optional[pd.DataFrame]:
+    """
+    Table `name` of the current snapshot version, or None when there is no snapshot.
+    The frame is shared by every session of the process: treat it as read-only.
+    """
+    if not snapshots_enabled():
+        return None
+    version = current_snapshot_version()
+    if version is None:
+        return None
+    return _read_snapshot_table(name, version)
+
+
+def snapshot_first(table_name: Union[str, Callable[..., Optional[str]]], player_filter_arg: Optional[str] = None):
+    """
+    Decorator for loaders: serve the snapshot table when one exists, else call the loader.
+
+    Args:
+        table_name: snapshot table name, or a function of the loader arguments (by keyword)
+            returning it (None = this call can't be served from the snapshot).
+        player_filter_arg: name of a player list argument applied as a player_name filter.
+    """
+    def decorator(loader):
+        signature = inspect.signature(loader)
+
+        @functools.wraps(loader)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            name = table_name(**bound.arguments) if callable(table_name) else table_name
+            snapshot = load_snapshot_table(name) if name else None
+            if snapshot is None:
+                # Defaults filled in: load_x() and load_x(arg=default) share one cache key
+                return loader(*bound.args, **bound.kwargs)
+
+            players = bound.arguments.get(player_filter_arg) if player_filter_arg else None
+            if players:
+                return snapshot[snapshot["player_name"].isin(players)]
+            return snapshot
+
+        wrapper.clear = getattr(loader, "clear", None)
+        return wrapper
+    return decorator
+
+
+def active_snapshot_version() -> Optional[str]:
+    # Version the snapshot_first loaders are serving right now (None = Supabase)
+    return current_snapshot_version() if snapshots_enabled() else None
+
+
+def snapshot_versioned(loader):
+    """
+    Decorator for cached loaders derived from snapshot_first ones: calls them with the
+    active snapshot version as the `snapshot_version` argument, so it is part of their
+    cache key and a new snapshot never mixes with frames built from the previous one.
+    """
+    signature = inspect.signature(loader)
+
+    @functools.wraps(loader)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, snapshot_version=active_snapshot_version(), **kwargs)
+        bound.apply_defaults()
+        return loader(*bound.args, **bound.kwargs)
+
+    wrapper.clear = getattr(loader, "clear", None)
+    return wrapper
+
+
+if __name__ == "__main__":
+    import time
+
+    os.environ["BIWENGER_SNAPSHOT"] = "off"
+    import utils
+
+    start = time.perf_counter()
+    tables = utils.load_concurrently({
+        "player_stats": utils.load_player_stats,
+        "player_stats_history": lambda: utils.load_player_stats(keep_latest=False),
+        "current_team": utils.load_current_team_players,
+        "player_matches": utils.load_player_matches,
+        "player_value": lambda: utils.load_market_value(player_names=None),
+    })
+    tables["timeline"] = utils.join_data(player_names=None)
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    version = write_snapshot(tables)
+    print(f"✅ Snapshot {version} written to {SNAPSHOT_DIR} in {time.perf_counter() - start:.1f}s")
+    for name, df in tables.items():
+        print(f"   {name}: {len(df)} rows")
@@ -0,0 +1,131 @@
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, Iterable, Mapping
+
+
+SQUAD_METRICS = ["total_value", "value_change_1d", "cumulative_points"]
+
+
+def build_squad_matrices(
+    value_matrix: pd.DataFrame,
+    matches: pd.DataFrame,
+    player_col: str = "player_name",
+    date_col: str = "match_date",
+    points_col: str = "points",
+) -> Dict[str, Any]:
+    """
+    Dense (players x dates) matrices on the value matrix calendar (load_value_matrix):
+    forward-filled market value, whether the player has a value yet, and season
+    cumulative points. Built once per data version; squad_timeseries only reads them.
+    """
+    if value_matrix.empty:
+        players, dates = pd.Index([], dtype=object), pd.DatetimeIndex([])
+        empty = np.empty((0, 0))
+        return {"players": players, "dates": dates, "values": empty, "priced": empty, "points": empty}
+
+    players, dates = value_matrix.index, value_matrix.columns
+
+    # Price of a day without a scrape = last known price
+    values = value_matrix.ffill(axis=1).to_numpy(dtype="float64")
+    priced = ~np.isnan(values)
+
+    points = np.zeros(values.shape)
+    matches = matches.dropna(subset=[player_col, date_col])
+    if not matches.empty:
+        daily = matches.pivot_table(
+            index=player_col,
+            columns=matches[date_col].dt.normalize(),
+            values=points_col,
+            aggfunc="sum",
+        )
+        # Cumulative over the whole season, then read off on the value calendar
+        cumulative = daily.reindex(index=players).fillna(0).cumsum(axis=1)
+        calendar = cumulative.columns.union(dates)
+        points = cumulative.reindex(columns=calendar).ffill(axis=1).reindex(columns=dates).fillna(0).to_numpy(dtype="float64")
+
+    return {
+        "players": players,
+        "dates": dates,
+        "values": np.nan_to_num(values),
+        "priced": priced.astype("float64"),
+        "points": points,
+    }
+
+
+def squad_timeseries(matrices: Dict[str, Any], squads: Mapping[str, Iterable[str]]) -> pd.DataFrame:
+    """
+    Total market value, daily value change and cumulative points of every squad over time.
+    All squads at once: a (squads x players) membership matrix times each
+    (players x dates) matrix, no per-player loops.
+
+    Args:
+        matrices: output of build_squad_matrices.
+        squads: squad name -> player names (names without market data are ignored).
+
+    Returns:
+        Long DataFrame: squad, date, total_value, value_change_1d, cumulative_points, players_priced.
+    """
+    columns = ["squad", "date"] + SQUAD_METRICS + ["players_priced"]
+    names = list(squads)
+    if not names or matrices["dates"].empty:
+        return pd.DataFrame(columns=columns)
+
+    membership = np.zeros((len(names), matrices["players"].size))
+    for i, name in enumerate(names):
+        rows = matrices["players"].get_indexer(pd.Index(list(squads[name])).unique())
+        membership[i, rows[rows >= 0]] = 1.0
+
+    total_value = membership @ matrices["values"]
+    value_change = np.diff(total_value, axis=1, prepend=np.nan)
+    cumulative_points = membership @ matrices["points"]
+    players_priced = membership @ matrices["priced"]
+
+    n_dates = matrices["dates"].size
+    return pd.DataFrame({
+        "squad": np.repeat(names, n_dates),
+        "date": np.tile(matrices["dates"].to_numpy(), len(names)),
+        "total_value": total_value.ravel(),
+        "value_change_1d": value_change.ravel(),
+        "cumulative_points": cumulative_points.ravel(),
+        "players_priced": players_priced.ravel().astype(int),
+    })
+
+
+if __name__ == "__main__":
+    import time
+    from utils_market_trends import build_value_matrix
+
+    # Benchmark: 600 players x 365 days, tracking 20 league squads of 15 players
+    rng = np.random.default_rng(0)
+    n_players, n_days = 600, 365
+    player_names = np.array([f"player_{i}" for i in range(n_players)])
+    dates = pd.date_range("2025-08-01", periods=n_days, freq="D")
+    values = pd.DataFrame({
+        "player_name": np.repeat(player_names, n_days),
+        "date": np.tile(dates, n_players),
+        "market_value_eur": rng.integers(1, 300, n_players * n_days) * 100_000,
+    })
+    match_days = dates[::7]
+    matches = pd.DataFrame({
+        "player_name": np.repeat(player_names, match_days.size),
+        "match_date": np.tile(match_days, n_players),
+        "points": rng.integers(-2, 15, n_players * match_days.size),
+    })
+    squads = {f"squad_{i}": rng.choice(player_names, 15, replace=False) for i in range(20)}
+
+    start = time.perf_counter()
+    matrices = build_squad_matrices(build_value_matrix(values), matches)
+    print(f"Matrices (once per data version): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    out = squad_timeseries(matrices, squads)
+    print(f"{len(squads)} squads: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    # Same numbers with a per-player merge/groupby
+    squad = squads["squad_0"]
+    expected = values[values["player_name"].isin(squad)].groupby("date")["market_value_eur"].sum()
+    got = out[out["squad"] == "squad_0"].set_index("date")["total_value"]
+    points = matches[matches["player_name"].isin(squad)]["points"].sum()
+    print("ok" if np.allclose(expected.to_numpy(), got.to_numpy())
+          and got.size == expected.size
+          and out[out["squad"] == "squad_0"]["cumulative_points"].iloc[-1] == points else "MISMATCH")
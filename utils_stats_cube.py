@@ -0,0 +1,108 @@
+import pandas as pd
+import numpy as np
+from itertools import combinations
+from typing import Iterable, Optional, Sequence
+
+
+ALL_SEGMENTS = "__all__"
+SEGMENT_DIMS = ("season", "position", "team")
+CUBE_QUANTILES = (0.33, 0.67)
+
+
+def build_stats_cube(
+    df: pd.DataFrame,
+    metrics: Iterable[str],
+    dims: Sequence[str] = SEGMENT_DIMS,
+) -> pd.DataFrame:
+    """
+    Pre-aggregate quantiles, mean and count of every metric for every combination of
+    the segment dimensions (a full CUBE: every dim either fixed or rolled up to ALL_SEGMENTS).
+
+    Returns:
+        DataFrame indexed by (*dims, "metric") with columns q33, q67, mean, count.
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    dims = list(dims)
+    if df.empty or not metrics:
+        index = pd.MultiIndex.from_tuples([], names=dims + ["metric"])
+        return pd.DataFrame(columns=["q33", "q67", "mean", "count"], index=index)
+
+    values = df[metrics].apply(pd.to_numeric, errors="coerce")
+
+    frames = []
+    for r in range(len(dims) + 1):
+        for subset in combinations(dims, r):
+            keys = [df[d] if d in subset else pd.Series(ALL_SEGMENTS, index=df.index, name=d) for d in dims]
+            grouped = values.groupby(keys, dropna=True)
+
+            stats = pd.concat(
+                {
+                    "q33": grouped.quantile(CUBE_QUANTILES[0]),
+                    "q67": grouped.quantile(CUBE_QUANTILES[1]),
+                    "mean": grouped.mean(),
+                    "count": grouped.count(),
+                },
+                axis=1,
+            )
+            frames.append(stats.stack(level=1, future_stack=True))
+
+    cube = pd.concat(frames)
+    cube.index = cube.index.set_names(dims + ["metric"])
+    return cube
+
+
+def add_segment_ranks(
+    df: pd.DataFrame,
+    metrics: Iterable[str],
+    season_col: str = "season",
+    position_col: str = "position",
+    team_col: str = "team",
+) -> pd.DataFrame:
+    """
+    Add percentile ranks (0-100) of every metric inside the player's
+    season x position (<metric>_pct_position) and season x team (<metric>_pct_team).
+    """
+    metrics = [m for m in metrics if m in df.columns]
+    if df.empty or not metrics:
+        return df
+
+    values = df[metrics].apply(pd.to_numeric, errors="coerce")
+    by_position = values.groupby([df[season_col], df[position_col]]).rank(pct=True) * 100
+    by_team = values.groupby([df[season_col], df[team_col]]).rank(pct=True) * 100
+
+    return df.assign(
+        **{f"{m}_pct_position": np.round(by_position[m], 1) for m in metrics},
+        **{f"{m}_pct_team": np.round(by_team[m], 1) for m in metrics},
+    )
+
+
+def _segment_key(selection: Optional[Iterable]) -> Optional[str]:
+    # Page filters: empty selection = no filter (ALL), one value = that segment.
+    # Several values are a union of segments whose quantiles can't be read off the cube.
+    selection = list(selection or [])
+    if not selection:
+        return ALL_SEGMENTS
+    if len(selection) == 1:
+        return selection[0]
+    return None
+
+
+def lookup_tertiles(
+    cube: pd.DataFrame,
+    metric: str,
+    season: Optional[Iterable] = None,
+    position: Optional[Iterable] = None,
+    team: Optional[Iterable] = None,
+) -> Optional[tuple[float, float]]:
+    """
+    Return the (q33, q67) guides of a metric for the current filters, or None when
+    the selection is not a single cube cell (the caller then computes them directly).
+    """
+    key = tuple(_segment_key(s) for s in (season, position, team))
+    if any(k is None for k in key):
+        return None
+    try:
+        row = cube.loc[key + (metric,)]
+    except KeyError:
+        return None
+    return float(row["q33"]), float(row["q67"])
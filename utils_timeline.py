@@ -0,0 +1,178 @@
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, Optional
+
+
+# Player code in the high bits, seconds since epoch in the low 34 bits (good until 2514)
+_TIME_BITS = 34
+
+
+def _player_codes(names: pd.Index, players: pd.Series) -> np.ndarray:
+    # Hash lookup against the (small, sorted) set of names, so codes follow name order
+    return pd.Categorical(players, categories=names).codes.astype(np.int64)
+
+
+def _sort_keys(codes: np.ndarray, times: pd.Series) -> np.ndarray:
+    seconds = times.to_numpy(dtype="datetime64[ns]").astype("datetime64[s]").astype(np.int64)
+    return (codes << _TIME_BITS) | (seconds & ((1 << _TIME_BITS) - 1))
+
+
+def asof_indices(
+    left_codes: np.ndarray,
+    left_keys: np.ndarray,
+    right_codes: np.ndarray,
+    right_keys: np.ndarray,
+) -> np.ndarray:
+    """
+    Position of the latest right row of the same player at or before each left row
+    (-1 when there is none). Right keys are only sorted when they aren't already,
+    so pre-sorted cached inputs cost a single O(n) check plus the binary searches.
+    """
+    if right_keys.size == 0:
+        return np.full(left_keys.size, -1, dtype=np.int64)
+
+    order: Optional[np.ndarray] = None
+    if not np.all(right_keys[1:] >= right_keys[:-1]):
+        order = np.argsort(right_keys, kind="stable")
+        right_keys, right_codes = right_keys[order], right_codes[order]
+
+    pos = np.searchsorted(right_keys, left_keys, side="right") - 1
+    valid = (pos >= 0) & (right_codes[np.maximum(pos, 0)] == left_codes)
+    if order is not None:
+        pos = order[np.maximum(pos, 0)]
+    return np.where(valid, pos, -1)
+
+
+def _attach(left: pd.DataFrame, right: pd.DataFrame, idx: np.ndarray, player_col: str) -> pd.DataFrame:
+    # reindex with -1 (not in the RangeIndex) yields an all-NaN row for "no match"
+    attached = right.drop(columns=[player_col]).reset_index(drop=True).reindex(idx)
+    attached.index = left.index
+    attached.columns = [f"{c}_y" if c in left.columns else c for c in attached.columns]
+    return pd.concat([left, attached], axis=1)
+
+
+def asof_join_timeline(
+    values: pd.DataFrame,
+    matches: pd.DataFrame,
+    stats: pd.DataFrame,
+    *,
+    player_col: str = "player_name",
+    value_date_col: str = "date",
+    match_date_col: str = "match_date",
+    stats_date_col: str = "as_of_date",
+) -> pd.DataFrame:
+    """
+    Attach to every market value row the player's most recent match (match_date <= date)
+    and latest stats snapshot (as_of_date <= date), instead of exact-date merges that
+    leave most rows empty.
+
+    Inputs sorted by (player_col, date) — as the cached loaders return them — are used
+    without re-sorting. Row order of `values` is preserved.
+    """
+    if values.columns.empty:
+        # No value table at all (the loader got no rows)
+        return values
+
+    matches = matches.dropna(subset=[match_date_col])
+    stats = stats.dropna(subset=[stats_date_col])
+
+    names = pd.Index(sorted(
+        set(values[player_col].dropna().unique())
+        | set(matches[player_col].dropna().unique())
+        | set(stats[player_col].dropna().unique())
+    ))
+
+    left_codes = _player_codes(names, values[player_col])
+    left_keys = _sort_keys(left_codes, values[value_date_col])
+
+    timeline = values
+    for right, date_col in ((matches, match_date_col), (stats, stats_date_col)):
+        right_codes = _player_codes(names, right[player_col])
+        idx = asof_indices(left_codes, left_keys, right_codes, _sort_keys(right_codes, right[date_col]))
+        timeline = _attach(timeline, right, idx, player_col)
+
+    return timeline
+
+
+def build_history_index(
+    history: pd.DataFrame,
+    player_col: str = "player_name",
+    date_col: str = "as_of_date",
+) -> Dict[str, Any]:
+    """
+    (player, date) index over the full stats history (load_player_stats(keep_latest=False)).
+    Rows are kept in (player, date) order, sorting only if the input isn't already.
+    """
+    history = history.dropna(subset=[player_col, date_col])
+    names = pd.Index(sorted(history[player_col].unique()))
+    codes = _player_codes(names, history[player_col])
+    keys = _sort_keys(codes, history[date_col])
+
+    if not np.all(keys[1:] >= keys[:-1]):
+        order = np.argsort(keys, kind="stable")
+        history, keys = history.iloc[order], keys[order]
+
+    return {
+        "frame": history.reset_index(drop=True),
+        "keys": keys,
+        "player_keys": np.arange(names.size, dtype=np.int64) << _TIME_BITS,
+        "dates": np.sort(history[date_col].unique()),
+    }
+
+
+def snapshot_as_of(index: Dict[str, Any], as_of_date) -> pd.DataFrame:
+    """
+    Latest row of every player at or before `as_of_date`: one binary search per player
+    on the pre-sorted keys, no re-deduplication of the history.
+    """
+    seconds = np.int64(pd.Timestamp(as_of_date).value // 1_000_000_000) & ((1 << _TIME_BITS) - 1)
+    query = index["player_keys"] | seconds
+
+    pos = np.searchsorted(index["keys"], query, side="right") - 1
+    valid = pos >= 0
+    valid[valid] = (index["keys"][pos[valid]] >> _TIME_BITS) == (index["player_keys"][valid] >> _TIME_BITS)
+    return index["frame"].iloc[pos[valid]].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import time
+
+    # Benchmark against the exact-date double merge used by join_data before
+    rng = np.random.default_rng(0)
+    n_players, n_days = 600, 365
+    players = np.array([f"player_{i:03d}" for i in range(n_players)])
+    dates = pd.date_range("2025-08-01", periods=n_days, freq="D")
+
+    values = pd.DataFrame({
+        "player_name": np.repeat(players, n_days),
+        "date": np.tile(dates, n_players),
+        "market_value_eur": rng.integers(1, 300, n_players * n_days) * 100_000,
+    })
+    match_days = dates[::7]
+    matches = pd.DataFrame({
+        "player_name": np.repeat(players, match_days.size),
+        "match_date": np.tile(match_days, n_players),
+        "points": rng.integers(-2, 15, n_players * match_days.size),
+    })
+    stats_days = dates[3::7]
+    stats = pd.DataFrame({
+        "player_name": np.repeat(players, stats_days.size),
+        "as_of_date": np.tile(stats_days, n_players),
+        "total_points": rng.integers(0, 200, n_players * stats_days.size),
+        "points_per_game": rng.random(n_players * stats_days.size) * 10,
+    })
+
+    def double_merge():
+        full = pd.merge(values, matches, left_on=["player_name", "date"],
+                        right_on=["player_name", "match_date"], how="left")
+        return pd.merge(full, stats, left_on=["player_name", "date"],
+                        right_on=["player_name", "as_of_date"], how="left")
+
+    for label, fn in (("exact double merge", double_merge),
+                      ("as-of join (pre-sorted)", lambda: asof_join_timeline(values, matches, stats))):
+        start = time.perf_counter()
+        for _ in range(5):
+            out = fn()
+        elapsed = (time.perf_counter() - start) * 1000 / 5
+        filled = out["total_points"].notna().mean() * 100
+        print(f"{label:>25}: {elapsed:7.1f} ms | rows {len(out)} | stats attached on {filled:5.1f}% of rows")
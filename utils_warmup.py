@@ -0,0 +1,121 @@
+import streamlit as st
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+WARMUP_THREAD_NAME = "cache-warmup"
+# Streamlit logs a warning for every cached call made outside a script run
+SCRIPT_RUN_CONTEXT_LOGGER = "streamlit.runtime.scriptrunner_utils.script_run_context"
+
+
+def warmup_steps() -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Every loader cache and derived index the pages read on their first run, called
+    with the same arguments the pages use so they land on the same cache keys.
+    """
+    # Imported here: utils pulls in every engine module, part of the work we want
+    # off the main thread.
+    import utils
+    from utils_news import load_player_news_flags
+    from utils_plotting import STATS_CHART_METRICS, MARKET_CHART_METRICS
+
+    def _player_names() -> tuple:
+        return tuple(sorted(utils.load_player_stats()['player_name'].dropna().unique().tolist()))
+
+    return [
+        ("Tablas", lambda: utils.load_concurrently({
+            "player_stats": utils.load_player_stats,
+            "player_stats_history": lambda: utils.load_player_stats(keep_latest=False),
+            "current_team": utils.load_current_team_players,
+            "player_matches": utils.load_player_matches,
+            "player_value": lambda: utils.load_market_value(player_names=None),
+        })),
+        ("Estadisticas por segmento", lambda: [
+            (utils.load_player_stats_ranked(tuple(m)), utils.load_stats_cube(tuple(m)))
+            for m in (STATS_CHART_METRICS, MARKET_CHART_METRICS)
+        ]),
+        ("Indice de similitud", utils.load_similarity_index),
+        ("Historial de estadisticas", utils.load_player_stats_history_index),
+        ("Forma reciente", utils.load_player_form),
+        ("Tendencias de mercado", lambda: utils.load_market_trends(window=7, horizon=7)),
+        ("Evolucion de la plantilla", utils.load_squad_matrices),
+        ("Jugadores que mas suben y bajan", lambda: utils.load_top_movers(
+            window="7d", k=10, pct=False, positions=(), teams=(),
+        )),
+        ("Evolucion del valor", lambda: utils.join_data(player_names=[])),
+        ("Noticias por jugador", lambda: load_player_news_flags(_player_names())),
+    ]
+
+
+@st.cache_resource
+def get_warmup_state() -> Dict[str, Any]:
+    # One per server process, shared by every session
+    return {
+        "status": "pending",      # pending -> running -> done
+        "done": 0,
+        "total": 0,
+        "current": None,
+        "started_at": None,
+        "duration_s": None,
+        "errors": [],
+        "lock": threading.Lock(),
+    }
+
+
+def _is_not_warmup_context_warning(record: logging.LogRecord) -> bool:
+    # The warm-up thread and its loader workers (load_concurrently names them after
+    # it) run without a ScriptRunContext by design; other threads still warn
+    return not (record.threadName.startswith(WARMUP_THREAD_NAME) and "missing ScriptRunContext" in record.getMessage())
+
+
+def run_warmup(state: Dict[str, Any]) -> None:
+    context_logger = logging.getLogger(SCRIPT_RUN_CONTEXT_LOGGER)
+    context_logger.addFilter(_is_not_warmup_context_warning)
+    try:
+        _run_warmup_steps(state)
+    finally:
+        context_logger.removeFilter(_is_not_warmup_context_warning)
+
+
+def _run_warmup_steps(state: Dict[str, Any]) -> None:
+    start = time.perf_counter()
+    state["started_at"] = time.time()
+
+    try:
+        steps = warmup_steps()
+    except Exception as e:
+        steps = []
+        state["errors"].append(("Inicializacion", repr(e)))
+        logger.exception("Cache warm-up could not start")
+    state["total"] = len(steps)
+
+    for label, step in steps:
+        state["current"] = label
+        try:
+            step()
+        except Exception as e:
+            # A failing table must not stop the rest from warming up
+            state["errors"].append((label, repr(e)))
+            logger.exception("Cache warm-up step '%s' failed", label)
+        state["done"] += 1
+
+    state["current"] = None
+    state["duration_s"] = round(time.perf_counter() - start, 2)
+    state["status"] = "done"
+    logger.info("Cache warm-up finished in %ss (%d errors)", state["duration_s"], len(state["errors"]))
+
+
+def start_warmup() -> Dict[str, Any]:
+    """
+    Start the warm-up thread once per process (later calls just return its state).
+    """
+    state = get_warmup_state()
+    with state["lock"]:
+        if state["status"] == "pending":
+            state["status"] = "running"
+            threading.Thread(target=run_warmup, args=(state,), name=WARMUP_THREAD_NAME, daemon=True).start()
+    return state